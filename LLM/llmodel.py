@@ -1,17 +1,20 @@
+import asyncio
+import functools
+import hashlib
+import importlib
+import importlib.util
 import json
 import os
+import re
+import shelve
+import sys
+import threading
 from abc import ABC
 from typing import Optional, Type
 
-from langchain.agents import create_agent
-from langchain_community.chat_models.tongyi import ChatTongyi
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import Runnable
-from langchain_deepseek import ChatDeepSeek
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable, RunnableConfig
 from loguru import logger
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
@@ -29,36 +32,50 @@ class LLMConfig(BaseSettings):
     # max_retries: int = 4
     system_prompt: str = ""
 
+    @functools.cached_property
+    def description(self) -> str:
+        """The sanitized ``{provider}_{model}`` string, computed once."""
+        # Replace characters potentially problematic in directory names (like '.') with underscores.
+        safe_model_name = (
+            self.model.replace(".", "_").replace("/", "_").replace(":", "-")
+        )
+        return f"{self.provider}_{safe_model_name}"
+
     def get_description(self) -> str:
         """
         Returns a description of the LLM configuration.
         Returns:
             str: A description of the LLM configuration, suitable for use as a directory name.
         """
-        # Replace characters potentially problematic in directory names (like '.') with underscores.
-        safe_model_name = (
-            self.model.replace(".", "_").replace("/", "_").replace(":", "-")
-        )
-        return f"{self.provider}_{safe_model_name}"
+        return self.description
+
 
+@functools.lru_cache(maxsize=8)
+def _load_token_file(token_file: str) -> dict[str, str]:
+    """Parses the token file once into a ``{PROVIDER: token}`` mapping."""
+    token_file_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), token_file
+    )
+    tokens = {}
+    with open(token_file_path, "r") as f:
+        for line in f:
+            key, sep, value = line.strip().partition("=")
+            if sep and key not in tokens:
+                tokens[key] = value.strip().strip('"')  # Remove quotes if present
+    return tokens
 
+
+@functools.lru_cache(maxsize=32)
 def read_token_from_file(token_file: str, provider: str) -> str:
     """Reads the token from the specified file based on the provider."""
     if provider == "ollama":
         return ""
 
     try:
-        token_file_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), token_file
-        )
-        with open(token_file_path, "r") as f:
-            lines = f.readlines()
-
-        for line in lines:
-            if line.startswith(provider.upper() + "="):
-                _, value = line.strip().split("=", 1)
-                value = value.strip().strip('"')  # Remove quotes if present
-                return value
+        tokens = _load_token_file(token_file)
+        value = tokens.get(provider.upper())
+        if value is not None:
+            return value
 
         logger.error(f"Token not found for provider: {provider}")
         raise ValueError(f"Token not found for provider: {provider}")
@@ -70,20 +87,138 @@ def read_token_from_file(token_file: str, provider: str) -> str:
         raise RuntimeError(f"Error reading token file: {e}")
 
 
+# OpenAI-compatible providers that accept a shared httpx client. ChatTongyi (qwen)
+# talks to DashScope through its own SDK and cannot take one.
+_HTTPX_PROVIDERS = frozenset({"openai", "deepseek", "vllm", "sglang"})
+# Providers whose SDK exposes the OpenAI Batch API.
+_BATCH_PROVIDERS = frozenset({"openai"})
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client():
+    """One pooled sync client per process, so keep-alive connections survive across LLModel instances."""
+    import httpx
+
+    http2 = importlib.util.find_spec("h2") is not None
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=100),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_async_http_client():
+    """One pooled async client per process, on HTTP/2 when ``h2`` is installed."""
+    import httpx
+
+    http2 = importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=256),
+    )
+
+
+# Model-name fragments and their short forms, longest match first so that
+# e.g. "qwen2.5" wins over "qwen".
+_SHORT_NAMES = (
+    ("qwen2.5", "qwen2.5"),
+    ("deepseek-r1", "deepseek-r1"),
+    ("deepseek-chat", "deepseek"),
+    ("gpt", "gpt"),
+    ("qwen", "qwen"),
+    ("llama", "llama"),
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _short_name(model_client: str) -> str:
+    for key, short_name in _SHORT_NAMES:
+        if key in model_client:
+            return short_name
+    raise ValueError(f"Unknown model name: {model_client}")
+
+
+LLM_CACHE_PATH = ".llm_cache"
+
+# "[3] answer" lines produced for packed prompts; see LLModel.batch_prompt.
+_INDEXED_LINE_RE = re.compile(r"^\[(\d+)\]\s*(.*)$")
+_BATCH_PROMPT_INSTRUCTION = (
+    "Answer each of the following questions independently. Reply with exactly one line "
+    "per question, starting with the question's index in square brackets, e.g. `[0] answer`."
+)
+
+
+class _CachedRunnable(Runnable):
+    """
+    Wraps a chat runnable with an on-disk response cache (a ``shelve`` database).
+
+    The cache key is the SHA-256 of the model, system prompt, output format and input,
+    so identical requests are answered from disk instead of hitting the provider again.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        model: str,
+        system_prompt: str,
+        output_format: Optional[Type[BaseModel]] = None,
+        path: str = LLM_CACHE_PATH,
+    ):
+        self.runnable = runnable
+        self.model = model
+        self.system_prompt = system_prompt
+        self.output_format = output_format
+        self.path = path
+
+    def _key(self, input) -> str:
+        payload = json.dumps(
+            {
+                "sys": self.system_prompt,
+                "in": input,
+                "fmt": self.output_format.__name__ if self.output_format else None,
+                "model": self.model,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def invoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        key = self._key(input)
+        with self._lock, shelve.open(self.path) as cache:
+            if key in cache:
+                return cache[key]
+
+        result = self.runnable.invoke(input, config, **kwargs)
+
+        with self._lock, shelve.open(self.path) as cache:
+            cache[key] = result
+        return result
+
+
 class LLModel(ABC):
     """
     Abstract base class for LLM models.
     """
 
+    # Provider SDKs are imported on first use; each one pulls in a large dependency tree.
     _chat_model_map = {
-        "openai": ChatOpenAI,
-        "qwen": ChatTongyi,  # Assuming Qwen is compatible with OpenAI's interface
-        "deepseek": ChatDeepSeek,
-        "google": ChatGoogleGenerativeAI,
-        "vllm": ChatOpenAI,
-        "sglang": ChatOpenAI,
-        "ollama": ChatOllama,
+        "openai": "langchain_openai:ChatOpenAI",
+        "qwen": "langchain_community.chat_models.tongyi:ChatTongyi",  # Assuming Qwen is compatible with OpenAI's interface
+        "deepseek": "langchain_deepseek:ChatDeepSeek",
+        "google": "langchain_google_genai:ChatGoogleGenerativeAI",
+        "vllm": "langchain_openai:ChatOpenAI",
+        "sglang": "langchain_openai:ChatOpenAI",
+        "ollama": "langchain_ollama:ChatOllama",
     }
+    _chat_model_classes: dict[str, type] = {}
+    # Chat model instances shared by every LLModel built with the same settings.
+    _chat_model_instances: dict[tuple, object] = {}
+    # Prompt templates are immutable, so instances share them per system prompt.
+    _prompt_cache: dict[str, ChatPromptTemplate] = {}
+    _system_message_cache: dict[str, SystemMessage] = {}
     # Provider-specific configuration adjustments
     _provider_base_urls = {
         "ollama": "http://localhost:11434",
@@ -104,23 +239,42 @@ class LLModel(ABC):
         self.system_prompt = config.system_prompt
         self.total_input_tokens = 0
         self.total_completion_tokens = 0
+        self._description = config.description
+        # Chains keyed by (kind, system prompt, output format); see _build_chain.
+        self._chain_cache: dict[tuple, Runnable] = {}
+        self._structured_llm_cache: dict[Type[BaseModel], Runnable] = {}
         api_key = read_token_from_file(config.token_file, config.provider)
 
-        # Adjust base URL based on provider
-        config.base_url = self._provider_base_urls.get(self.provider, "")
+        # Provider-specific base URL wins; the config is left untouched.
+        base_url = self._provider_base_urls.get(self.provider) or config.base_url or None
         # Get the appropriate chat model class and initialize LLM
-        chat_model_class = self._chat_model_map.get(self.provider)
-        if not chat_model_class:
-            raise ValueError(f"Unsupported provider: {self.provider}")
-
-        self.llm = chat_model_class(
-            model=config.model,
-            request_timeout=config.request_timeout,
-            # max_retries=config.max_retries,
-            max_tokens=config.max_tokens,
-            api_key=api_key,
-            base_url=config.base_url if config.base_url else None,
+        chat_model_class = self._resolve_chat_model_class(self.provider)
+
+        instance_key = (
+            self.provider,
+            config.model,
+            config.request_timeout,
+            config.max_tokens,
+            base_url,
+            api_key,
         )
+        self.llm = self._chat_model_instances.get(instance_key)
+        if self.llm is None:
+            extra_kwargs = {}
+            if self.provider in _HTTPX_PROVIDERS:
+                extra_kwargs["http_client"] = _shared_http_client()
+                extra_kwargs["http_async_client"] = _shared_async_http_client()
+
+            self.llm = chat_model_class(
+                model=config.model,
+                request_timeout=config.request_timeout,
+                # max_retries=config.max_retries,
+                max_tokens=config.max_tokens,
+                api_key=api_key,
+                base_url=base_url,
+                **extra_kwargs,
+            )
+            self._chat_model_instances[instance_key] = self.llm
 
     def get_description(self) -> str:
         """
@@ -129,11 +283,28 @@ class LLModel(ABC):
         Returns:
             str: A description of the LLM model, suitable for use as a directory name.
         """
-        # Replace characters potentially problematic in directory names (like '.') with underscores.
-        safe_model_name = (
-            self.config.model.replace(".", "_").replace("/", "_").replace(":", "-")
-        )
-        return f"{self.provider}_{safe_model_name}"
+        return self._description
+
+    @classmethod
+    def _resolve_chat_model_class(cls, provider: str) -> type:
+        """
+        Imports and returns the chat model class for the provider, memoized per class path.
+
+        Args:
+            provider (str): The provider name.
+
+        Returns:
+            type: The LangChain chat model class.
+        """
+        target = cls._chat_model_map.get(provider)
+        if not target:
+            raise ValueError(f"Unsupported provider: {provider}")
+        chat_model_class = cls._chat_model_classes.get(target)
+        if chat_model_class is None:
+            module_name, _, class_name = target.partition(":")
+            chat_model_class = getattr(importlib.import_module(module_name), class_name)
+            cls._chat_model_classes[target] = chat_model_class
+        return chat_model_class
 
     @classmethod
     def get_short_name(cls, model_client: str) -> str:
@@ -144,25 +315,7 @@ class LLModel(ABC):
         :return: The short name of the model client.
         :rtype: str
         """
-        # Define a dictionary mapping model names to their short forms
-        class_dict = {
-            "gpt": "gpt",
-            "qwen2.5": "qwen2.5",
-            "qwen": "qwen",
-            "llama": "llama",
-            "deepseek-chat": "deepseek",
-            "deepseek-r1": "deepseek-r1",
-        }
-
-        # Iterate over each key in the dictionary
-        for key in class_dict:
-            # Check if the current key is a substring of the model_client string
-            if key in model_client:
-                # If found, return the corresponding value from the dictionary
-                return class_dict[key]
-
-        # If no keys are found in model_client, raise an exception
-        raise ValueError(f"Unknown model name: {model_client}")
+        return _short_name(model_client)
 
     @classmethod
     def from_config(cls, config: "LLMConfig") -> "LLModel":
@@ -178,7 +331,10 @@ class LLModel(ABC):
         return cls(config)
 
     def create_chat(
-        self, system_prompt: str = "", output_format: Optional[BaseModel] = None
+        self,
+        system_prompt: str = "",
+        output_format: Optional[BaseModel] = None,
+        use_cache: bool = False,
     ):
         """
         Creates a chat runnable with the LLM, incorporating a system prompt if provided.
@@ -186,6 +342,7 @@ class LLModel(ABC):
         Args:
             system_prompt (Optional[str]): The system prompt to guide the conversation.
             output_format (Optional[BaseModel]): The format for structured output, which can be a subclass of BaseModel.
+            use_cache (bool): Answer repeated requests from the on-disk response cache.
 
         Returns:
             A runnable chat object.
@@ -195,20 +352,18 @@ class LLModel(ABC):
         if system_prompt:
             self.system_prompt = system_prompt
 
-        # Use the provided system prompt
-        prompt = ChatPromptTemplate.from_messages(
-            [SystemMessage(content=self.system_prompt), ("human", "{input}")]
-        )
-
-        if output_format:
-            out = prompt | self.llm.with_structured_output(output_format)
-        else:
-            out = prompt | self.llm
-
-        return out
+        chain = self._build_chain("chat", self.system_prompt, output_format)
+        if use_cache:
+            return _CachedRunnable(
+                chain, self.config.model, self.system_prompt, output_format
+            )
+        return chain
 
     def create_stateless_chat(
-        self, system_prompt: str = "", output_format: Optional[Type[BaseModel]] = None
+        self,
+        system_prompt: str = "",
+        output_format: Optional[Type[BaseModel]] = None,
+        use_cache: bool = False,
     ):
         """
         Creates a stateless chat runnable that does not modify the instance's system prompt.
@@ -216,6 +371,7 @@ class LLModel(ABC):
         Args:
             system_prompt (str): The system prompt to use for this chat.
             output_format (Optional[Type[BaseModel]]): The Pydantic model for structured output.
+            use_cache (bool): Answer repeated requests from the on-disk response cache.
 
         Returns:
             A runnable chat object.
@@ -226,18 +382,281 @@ class LLModel(ABC):
         # Use the provided system prompt or the instance's default
         current_prompt = system_prompt if system_prompt else self.system_prompt
 
-        if output_format:
-            return create_agent(
+        chain = self._build_chain("stateless", current_prompt, output_format)
+        if use_cache:
+            return _CachedRunnable(
+                chain, self.config.model, current_prompt, output_format
+            )
+        return chain
+
+    @classmethod
+    def _prompt_template(cls, system_prompt: str) -> ChatPromptTemplate:
+        """
+        Returns the ``[system, human]`` prompt template for the system prompt, shared across instances.
+
+        Args:
+            system_prompt (str): The system prompt of the template.
+
+        Returns:
+            ChatPromptTemplate: The cached prompt template.
+        """
+        system_prompt = sys.intern(system_prompt)
+        prompt = cls._prompt_cache.get(system_prompt)
+        if prompt is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [cls._system_message(system_prompt), ("human", "{input}")]
+            )
+            cls._prompt_cache[system_prompt] = prompt
+        return prompt
+
+    @classmethod
+    def _system_message(cls, system_prompt: str) -> SystemMessage:
+        """
+        Returns a shared SystemMessage for the (interned) system prompt.
+
+        Args:
+            system_prompt (str): The system prompt content.
+
+        Returns:
+            SystemMessage: The cached system message.
+        """
+        system_prompt = sys.intern(system_prompt)
+        message = cls._system_message_cache.get(system_prompt)
+        if message is None:
+            message = SystemMessage(content=system_prompt)
+            cls._system_message_cache[system_prompt] = message
+        return message
+
+    def _structured_llm(self, output_format: Type[BaseModel]) -> Runnable:
+        """
+        Returns ``self.llm.with_structured_output(output_format)``, building it once per model class.
+
+        Args:
+            output_format (Type[BaseModel]): The Pydantic model for structured output.
+
+        Returns:
+            Runnable: The structured-output runnable.
+        """
+        structured = self._structured_llm_cache.get(output_format)
+        if structured is None:
+            structured = self.llm.with_structured_output(output_format)
+            self._structured_llm_cache[output_format] = structured
+        return structured
+
+    def _build_chain(
+        self,
+        kind: str,
+        system_prompt: str,
+        output_format: Optional[Type[BaseModel]] = None,
+    ) -> Runnable:
+        """
+        Returns the chat runnable for ``(kind, system_prompt, output_format)``, building it on first use.
+
+        Prompt templates and structured-output runnables are immutable, so the same chain
+        can be handed out for every call with an identical system prompt and output format.
+
+        Args:
+            kind (str): "chat" for a prompt-piped chain, "stateless" for the agent-based variant.
+            system_prompt (str): The system prompt of the chain.
+            output_format (Optional[Type[BaseModel]]): The Pydantic model for structured output.
+
+        Returns:
+            Runnable: The cached chat runnable.
+        """
+        key = (kind, system_prompt, output_format)
+        chain = self._chain_cache.get(key)
+        if chain is not None:
+            return chain
+
+        if kind == "stateless" and output_format:
+            from langchain.agents import create_agent
+
+            chain = create_agent(
                 self.llm,
                 tools=[],
                 response_format=output_format,
-                system_prompt=current_prompt, # Use the modified prompt
+                system_prompt=system_prompt,
             )
         else:
-            prompt = ChatPromptTemplate.from_messages(
-                [SystemMessage(content=current_prompt), ("human", "{input}")]
+            prompt = self._prompt_template(system_prompt)
+            if output_format:
+                chain = prompt | self._structured_llm(output_format)
+            else:
+                chain = prompt | self.llm
+
+        self._chain_cache[key] = chain
+        return chain
+
+    async def abatch(
+        self,
+        inputs: list[str],
+        system_prompt: str = "",
+        output_format: Optional[Type[BaseModel]] = None,
+        concurrency: int = 32,
+    ) -> list:
+        """
+        Runs the chat chain over many inputs concurrently, keeping at most ``concurrency`` requests in flight.
+
+        Args:
+            inputs (list[str]): The human messages to send.
+            system_prompt (str): The system prompt to use; defaults to the instance's prompt.
+            output_format (Optional[Type[BaseModel]]): The Pydantic model for structured output.
+            concurrency (int): Maximum number of simultaneous requests.
+
+        Returns:
+            list: The chain results, in the same order as ``inputs``.
+        """
+        if self.llm is None:
+            raise ValueError("LLM model not initialized.")
+
+        chain = self._build_chain(
+            "chat", system_prompt if system_prompt else self.system_prompt, output_format
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _invoke(text: str):
+            async with semaphore:
+                return await chain.ainvoke({"input": text})
+
+        return await asyncio.gather(*(_invoke(text) for text in inputs))
+
+    def batch_prompt(
+        self, prompts: list[str], per_batch: int = 6, system_prompt: str = ""
+    ) -> list[Optional[str]]:
+        """
+        Answers short prompts by packing up to ``per_batch`` of them into a single request.
+
+        Each packed request lists its prompts as ``[i] prompt`` lines and the answer lines are
+        matched back by their ``[i]`` prefix.
+
+        Args:
+            prompts (list[str]): The prompts to answer.
+            per_batch (int): How many prompts to pack into one request.
+            system_prompt (str): The system prompt to use; defaults to the instance's prompt.
+
+        Returns:
+            list[Optional[str]]: One answer per prompt, in input order; None where the model skipped an index.
+        """
+        if self.llm is None:
+            raise ValueError("LLM model not initialized.")
+
+        chain = self._build_chain(
+            "chat", system_prompt if system_prompt else self.system_prompt
+        )
+        answers: list[Optional[str]] = [None] * len(prompts)
+        for start in range(0, len(prompts), per_batch):
+            batch = prompts[start : start + per_batch]
+            packed = "\n".join(f"[{i}] {p}" for i, p in enumerate(batch))
+            response = chain.invoke({"input": f"{_BATCH_PROMPT_INSTRUCTION}\n\n{packed}"})
+            text = response.content if hasattr(response, "content") else str(response)
+            for line in text.splitlines():
+                match = _INDEXED_LINE_RE.match(line.strip())
+                if match and int(match.group(1)) < len(batch):
+                    answers[start + int(match.group(1))] = match.group(2)
+        return answers
+
+    def submit_batch(
+        self,
+        inputs: list[str],
+        system_prompt: str = "",
+        output_format: Optional[Type[BaseModel]] = None,
+    ) -> str:
+        """
+        Submits the inputs as one OpenAI Batch API job instead of one request per input.
+
+        Args:
+            inputs (list[str]): The human messages to send; request ``i`` gets custom id ``req-{i}``.
+            system_prompt (str): The system prompt to use; defaults to the instance's prompt.
+            output_format (Optional[Type[BaseModel]]): The Pydantic model for structured output.
+
+        Returns:
+            str: The batch id, to be passed to ``poll_batch``.
+        """
+        if self.provider not in _BATCH_PROVIDERS:
+            raise ValueError(f"Batch mode is not supported for provider: {self.provider}")
+
+        current_prompt = system_prompt if system_prompt else self.system_prompt
+        lines = []
+        for i, text in enumerate(inputs):
+            body = {
+                "model": self.config.model,
+                "max_tokens": self.config.max_tokens,
+                "messages": [
+                    {"role": "system", "content": current_prompt},
+                    {"role": "user", "content": text},
+                ],
+            }
+            if output_format:
+                body["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": output_format.__name__,
+                        "schema": output_format.model_json_schema(),
+                    },
+                }
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": f"req-{i}",
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": body,
+                    }
+                )
             )
-            return prompt | self.llm
+
+        client = self.llm.root_client
+        batch_file = client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(inputs)} requests")
+        return batch.id
+
+    def poll_batch(
+        self, batch_id: str, output_format: Optional[Type[BaseModel]] = None
+    ) -> Optional[dict]:
+        """
+        Fetches the results of a batch submitted with ``submit_batch``.
+
+        Args:
+            batch_id (str): The batch id returned by ``submit_batch``.
+            output_format (Optional[Type[BaseModel]]): Parse each answer into this model if given.
+
+        Returns:
+            Optional[dict]: ``{custom_id: answer}`` once the batch has completed, None while it is still running.
+                Failed requests map to None.
+        """
+        if self.provider not in _BATCH_PROVIDERS:
+            raise ValueError(f"Batch mode is not supported for provider: {self.provider}")
+
+        client = self.llm.root_client
+        batch = client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            logger.info(f"Batch {batch_id} is {batch.status}")
+            return None
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    results[record["custom_id"]] = None
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                if output_format:
+                    content = output_format.model_validate_json(content)
+                results[record["custom_id"]] = content
+        return results
 
     def create_tool_react(self, tools: list, system_prompt: str) -> Runnable:
         """
@@ -252,4 +671,7 @@ class LLModel(ABC):
 
         if self.llm is None:
             raise ValueError("LLM model not initialized.")
+
+        from langchain.agents import create_agent
+
         return create_agent(self.llm, tools=tools, system_prompt=system_prompt)
@@ -1,41 +1,34 @@
 from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Sensitive operation categories shared by the structured-output models below.
+SensitiveTypeEnum = Literal[
+    "Encryption",
+    "Decryption",
+    "Signature",
+    "Verification",
+    "Hash",
+    "Seed",
+    "Random",
+    "Serialization",
+    "Deserialization",
+]
 
 
 class SensitiveType(BaseModel):
-    type_list: Optional[
-        List[
-            Literal[
-                "Encryption",
-                "Decryption",
-                "Signature",
-                "Verification",
-                "Hash",
-                "Seed",
-                "Random",
-                "Serialization",
-                "Deserialization",
-            ]
-        ]
-    ] = Field(
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    type_list: Optional[List[SensitiveTypeEnum]] = Field(
         default_factory=list,
         description="List of sensitive operation. None if no sensitive operation appear",
     )
 
 
 class SensitiveStatementItem(BaseModel):
-    type: Literal[
-        "Encryption",
-        "Decryption",
-        "Signature",
-        "Verification",
-        "Hash",
-        "Seed",
-        "Random",
-        "Serialization",
-        "Deserialization",
-    ]
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    type: SensitiveTypeEnum
     statements: Optional[List[str]] = Field(
         default_factory=list,
         description="List of code statements for the given sensitive type.",
@@ -47,16 +40,22 @@ class SensitiveStatement(BaseModel):
     Used to answer 'List the code statements that involved in {query}'.
     """
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     statements: Optional[List["SensitiveStatementItem"]] = Field(
         default_factory=list,
         description="A list of objects, where each object contains a sensitive operation type and a list of corresponding code statements.",
     )
 
 
+SensitiveStatement.model_rebuild()
+
+
 class QuestionBool(BaseModel):
     """Boolean answer."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     answer: bool = Field(
         default=False, description="true if the answer is yes, false otherwise"
     )
-
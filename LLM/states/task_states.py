@@ -1,45 +1,61 @@
 from typing import Dict, List
 
 class TaskState:
-    """A base class for holding the state of a task."""
+    """
+    A base class for holding the state of a task.
+
+    Each required state is one bit of ``mask``; the task succeeds once every bit is set.
+    """
+    __slots__ = ('mask', 'full_mask', '_idx')
+
     def __init__(self, required_states: List[str]):
-        self.states: Dict[str, bool] = {state: False for state in required_states}
+        self._idx: Dict[str, int] = {state: 1 << i for i, state in enumerate(required_states)}
+        self.full_mask = (1 << len(required_states)) - 1
+        self.mask = 0
+
+    @property
+    def states(self) -> Dict[str, bool]:
+        """A ``{state: passed}`` view of the bitmask."""
+        return {state: bool(self.mask & bit) for state, bit in self._idx.items()}
 
     def reset(self):
-        for key in self.states:
-            self.states[key] = False
+        self.mask = 0
 
     def set_success(self, key: str):
-        if key in self.states:
-            self.states[key] = True
+        self.mask |= self._idx.get(key, 0)
 
     def set_failed(self, key: str):
-        if key in self.states:
-            self.states[key] = False
+        self.mask &= ~self._idx.get(key, 0)
 
     def is_success(self) -> bool:
-        if not self.states:
-            return True
-        return all(self.states.values())
+        return self.mask == self.full_mask
 
 class TestGenTaskState(TaskState):
     """A state manager for the test generation task."""
+    __slots__ = ('_unit_test_failed_mask',)
+
     def __init__(self):
         super().__init__(required_states=["unit_test", "coverage_pass"])
+        # If tests fail, coverage is no longer valid and must be re-evaluated.
+        self._unit_test_failed_mask = ~(self._idx['unit_test'] | self._idx['coverage_pass'])
 
     def set_failed(self, key: str):
-        super().set_failed(key)
-        # If tests fail, coverage is no longer valid and must be re-evaluated.
-        if key == 'unit_test' and 'coverage_pass' in self.states:
-            self.states['coverage_pass'] = False
+        if key == 'unit_test':
+            self.mask &= self._unit_test_failed_mask
+        else:
+            super().set_failed(key)
 
 class ConvertTaskState(TaskState):
     """A state manager for the conversion task."""
+    __slots__ = ('_cargo_check_failed_mask',)
+
     def __init__(self):
         super().__init__(required_states=["unit_test", "cargo_check"])
+        # If the crate no longer builds, earlier test results are no longer valid.
+        self._cargo_check_failed_mask = ~(self._idx['cargo_check'] | self._idx['unit_test'])
 
     def set_failed(self, key: str):
-        super().set_failed(key)
-        # If tests fail, coverage is no longer valid and must be re-evaluated.
         if key == 'cargo_check':
-            self.states['unit_test'] = False
+            self.mask &= self._cargo_check_failed_mask
+        else:
+            super().set_failed(key)
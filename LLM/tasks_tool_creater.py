@@ -1,12 +1,28 @@
+import functools
 import os
 
 from langchain_core.tools import BaseTool
-from langchain_community.agent_toolkits import FileManagementToolkit
 
 from LLM.states.task_states import TaskState
-from LLM.tools.cargo_tool import CargoCheckTool
 from LLM.tools.file_tool import ApplyDiffTool, ListProjectStructureTool
-from LLM.tools.language_tools import JacocCoverageTool, JavaCompileCheck, PythonUVInstallTestTool, TemplateForTrans, MavenExecuteUnitTestTool, CoveragePyTool, PytestExecuteUnitTestTool
+
+# The LangChain toolkit and the language/build tools are imported inside the factories
+# that use them, so each factory only pays for the tools it builds.
+
+_FILE_TOOL_NAMES = ("list_directory", "read_file", "write_file")
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_toolkit(root_dir: str, selected: tuple) -> tuple:
+    """
+    Build the FileManagementToolkit tools for ``root_dir`` once and reuse them.
+    The tools only hold their root_dir, so sharing them between agents is safe.
+    """
+    from langchain_community.agent_toolkits import FileManagementToolkit
+
+    toolkit = FileManagementToolkit(root_dir=root_dir, selected_tools=list(selected))
+    return tuple(toolkit.get_tools())
+
 
 def create_transform_tools(project_root_path: str,  language:str, task_state: TaskState) -> list[BaseTool]:
     """
@@ -22,6 +38,9 @@ def create_transform_tools(project_root_path: str,  language:str, task_state: Ta
     Returns:
         A list of configured common and file management tool functions.
     """
+    from LLM.tools.cargo_tool import CargoCheckTool
+    from LLM.tools.language_tools import MavenExecuteUnitTestTool, TemplateForTrans
+
     tools = [
         ListProjectStructureTool(project_root_path=project_root_path),
         ApplyDiffTool(project_root_path=project_root_path),
@@ -31,17 +50,14 @@ def create_transform_tools(project_root_path: str,  language:str, task_state: Ta
     ]
     # Only modify the rust code
     rust_project_path = os.path.join(project_root_path)
-    toolkit = FileManagementToolkit(
-        root_dir=str(rust_project_path),
-        selected_tools=["list_directory", "read_file", "write_file"]
-    )
-    root_tools = toolkit.get_tools()
-    tools.extend(root_tools)
+    tools.extend(_cached_toolkit(str(rust_project_path), _FILE_TOOL_NAMES))
     return tools
 
 def create_template_tools(project_root_path: str,  language:str) -> list[BaseTool]:
     """
     """
+    from LLM.tools.language_tools import TemplateForTrans
+
     tools = [
         TemplateForTrans(project_root_path=project_root_path),
     ]
@@ -67,20 +83,19 @@ def create_test_gen_tools(project_root_path: str,  language:str, task_state: Tas
         ApplyDiffTool(project_root_path=project_root_path),
     ]
 
-    toolkit = FileManagementToolkit(
-        root_dir=str(project_root_path),
-        selected_tools=["list_directory", "read_file", "write_file"]  # 选择需要的工具
-    )
-    root_tools = toolkit.get_tools()
-    tools.extend(root_tools)
+    tools.extend(_cached_toolkit(str(project_root_path), _FILE_TOOL_NAMES))
 
     if language == "java":
+        from LLM.tools.language_tools import JacocCoverageTool, JavaCompileCheck, MavenExecuteUnitTestTool
+
         tools.extend([
         JacocCoverageTool(project_root_path=project_root_path, task_state=task_state),
         JavaCompileCheck(project_root_path=project_root_path),
         MavenExecuteUnitTestTool(project_root_path=project_root_path, task_state=task_state)
         ])
     elif language == "python":
+        from LLM.tools.language_tools import CoveragePyTool, PytestExecuteUnitTestTool, PythonUVInstallTestTool
+
         tools.extend([
             CoveragePyTool(project_root_path=project_root_path, task_state=task_state),
             PytestExecuteUnitTestTool(project_root_path=project_root_path, task_state=task_state),
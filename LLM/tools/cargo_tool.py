@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+import mmap
+import pathlib
 import re
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Optional
 from langchain_core.tools import BaseTool
 import os
 
@@ -6,11 +13,21 @@ from loguru import logger
 from LLM.states.task_states import TaskState
 from utils import file_utils
 
-from utils.cli_utils import run_cmd
+from utils.cli_utils import clean_cmd_output, run_cmd
+from pydantic import PrivateAttr
 
 
 finish_str = "[Terminate] Terminate the current task immediately!"
 
+_ERROR_RE = re.compile(r'error(\[|:)', re.IGNORECASE)
+_FINISHED_RE = re.compile(r'Finished\s+`dev`\s+profile', re.IGNORECASE)
+# Errors reported by rustc itself, as opposed to cargo failing to fetch or run anything
+_COMPILE_ERROR_RE = re.compile(r'error\[E\d+\]|error: could not compile', re.IGNORECASE)
+_SUCCESS_OUTPUT = "The rust project is executable."
+_EMPTY_PROJECT_MSG = "project is empty, please write the code into rust/src/lib.rs"
+# Same limit run_cmd applies to the synchronous check
+_CARGO_CHECK_TIMEOUT = 30
+
 def cargo_new(project_path:str, lib:bool = True) -> str:
     """
     Create a new Rust project using Cargo within the project directory.
@@ -18,8 +35,8 @@ def cargo_new(project_path:str, lib:bool = True) -> str:
     Note that the content included in the initialized lib.rs is default, and you need to change it.
     (project_path and rust_name are bound from the factory function).
     """
-    rust_path = os.path.join(project_path, 'rust') # Use bound variables
-    if os.path.exists(rust_path):
+    rust_path = pathlib.Path(project_path, 'rust')
+    if rust_path.exists():
         return f"Directory '{rust_path}' already exists. Skipping 'cargo new' step."
 
     cmd = ["cargo", "new", "rust"]
@@ -28,19 +45,32 @@ def cargo_new(project_path:str, lib:bool = True) -> str:
 
     output = run_cmd(cmd, exe_env=project_path)
 
-    file_to_clear = 'lib.rs' if lib else 'main.rs'
-    file_path = os.path.join(rust_path, 'src', file_to_clear)
+    # cargo new has already created src/, so the default file only needs truncating
+    file_path = rust_path / 'src' / ('lib.rs' if lib else 'main.rs')
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write('')  # Clear the file content
-        #logger.info(f"Cleared default content from {file_path}")
-    except Exception as e:
+        file_path.write_bytes(b'')
+    except OSError as e:
         logger.error(f"Failed to clear content from {file_path}: {e}")
-        # Optionally return an error message or let the original output pass through
-        # return f"Cargo new succeeded, but failed to clear {file_to_clear}: {e}"
     return output
 
+def _crate_source_files(rust_project_path: str) -> list:
+    """Sorted paths, relative to the crate root, of every file under its src/ directory."""
+    files = []
+    stack = [os.path.join(rust_project_path, "src")]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        files.append(os.path.relpath(entry.path, rust_project_path))
+        except OSError:
+            continue
+    files.sort()
+    return files
+
 class CargoCheckTool(BaseTool):
     """
     Tool that checks the Rust project for errors.
@@ -60,29 +90,171 @@ class CargoCheckTool(BaseTool):
     def __init__(self, project_root_path: str, task_state: TaskState | None = None):
         super().__init__(project_root_path = project_root_path, task_state = task_state)
 
-    def _run(self) -> str:
+    # Opt-in cache of check results: {source hash: (output, "success" | "failed" | None)}.
+    # Enabled with AUTOTEE_CARGO_CACHE=1.
+    _check_cache: ClassVar["OrderedDict[str, tuple]"] = OrderedDict()
+    _check_cache_lock: ClassVar[threading.RLock] = threading.RLock()
+    _check_cache_size: ClassVar[int] = 64
+    # In-flight async checks: {(rust project path, source hash): future of (output, state)}
+    _inflight_checks: ClassVar[dict] = {}
+    # Source hash of the last check that passed; an unchanged crate skips cargo entirely.
+    _last_ok_hash: Optional[str] = PrivateAttr(default=None)
+
+    @staticmethod
+    def _source_key(rust_project_path: str) -> str:
+        """
+        Hash the crate sources that decide the check result: every file under src/,
+        build.rs, Cargo.toml and its mtime. Paths are hashed too, so renames change the key.
+        """
+        digest = hashlib.blake2b(rust_project_path.encode("utf-8"))
+        for rel_path in ("Cargo.toml", "build.rs", *_crate_source_files(rust_project_path)):
+            digest.update(rel_path.encode("utf-8", errors="surrogateescape"))
+            digest.update(b"\0")
+            path = os.path.join(rust_project_path, rel_path)
+            try:
+                with open(path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    digest.update(str(size).encode())
+                    digest.update(b"\0")
+                    # Hash straight from the page cache; mmap rejects empty files.
+                    if size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            digest.update(memoryview(mm))
+            except OSError:
+                pass
+            digest.update(b"\0")
+        try:
+            digest.update(str(os.stat(os.path.join(rust_project_path, "Cargo.toml")).st_mtime_ns).encode())
+        except OSError:
+            pass
+        return digest.hexdigest()
+
+    def _apply_state(self, state: str | None):
+        if not self.task_state or state is None:
+            return
+        if state == "success":
+            self.task_state.set_success("cargo_check")
+        else:
+            self.task_state.set_failed("cargo_check")
+
+    def _begin_check(self) -> tuple:
+        """
+        Handles everything that can answer a check without running cargo.
+
+        Returns:
+            (rust project path, source hash, cache enabled, early output or None)
+        """
         rust_project_path = os.path.join(f"{self.project_root_path}/rust")
         content = file_utils.read_file(f"{self.project_root_path}/rust/src/lib.rs")
         if not content:
             if self.task_state:
                 self.task_state.set_failed("cargo_check")
-            return "project is empty, please write the code into rust/src/lib.rs"
+            return rust_project_path, None, False, _EMPTY_PROJECT_MSG
+
+        key = self._source_key(rust_project_path)
+        if key == self._last_ok_hash:
+            logger.debug("Sources unchanged since the last successful cargo check of {}", rust_project_path)
+            self._apply_state("success")
+            return rust_project_path, key, False, _SUCCESS_OUTPUT
+
+        use_cache = os.environ.get("AUTOTEE_CARGO_CACHE") == "1"
+        if use_cache:
+            with self._check_cache_lock:
+                cached = self._check_cache.get(key)
+                if cached is not None:
+                    self._check_cache.move_to_end(key)
+            if cached is not None:
+                logger.debug("cargo check cache hit for {}", rust_project_path)
+                output, state = cached
+                self._apply_state(state)
+                self._last_ok_hash = key if state == "success" else None
+                return rust_project_path, key, use_cache, output
+
+        return rust_project_path, key, use_cache, None
+
+    @staticmethod
+    def _is_cacheable(output: str, state: str | None) -> bool:
+        """
+        Only results that depend on the sources alone are cached: a finished check or a
+        compiler error. Timeouts, spawn errors and registry failures are retried.
+        """
+        if output.startswith("Running error"):
+            return False
+        return (state == "success" or _FINISHED_RE.search(output) is not None
+                or _COMPILE_ERROR_RE.search(output) is not None)
+
+    def _finish_check(self, key: str, use_cache: bool, output: str, state: str | None) -> str:
+        """Records a fresh cargo check result and returns the tool output."""
+        if use_cache and self._is_cacheable(output, state):
+            with self._check_cache_lock:
+                self._check_cache[key] = (output, state)
+                self._check_cache.move_to_end(key)
+                while len(self._check_cache) > self._check_cache_size:
+                    self._check_cache.popitem(last=False)
+
+        self._apply_state(state)
+        self._last_ok_hash = key if state == "success" else None
+        return output
+
+    def _run(self) -> str:
+        rust_project_path, key, use_cache, early_output = self._begin_check()
+        if early_output is not None:
+            return early_output
+        output, state = self._cargo_check(rust_project_path)
+        return self._finish_check(key, use_cache, output, state)
+
+    async def _arun(self) -> str:
+        rust_project_path, key, use_cache, early_output = self._begin_check()
+        if early_output is not None:
+            return early_output
+
+        # Concurrent checks of the same sources share one cargo process.
+        inflight_key = (rust_project_path, key)
+        future = self._inflight_checks.get(inflight_key)
+        if future is None:
+            future = asyncio.ensure_future(self._acargo_check(rust_project_path))
+            self._inflight_checks[inflight_key] = future
+            future.add_done_callback(lambda _: self._inflight_checks.pop(inflight_key, None))
+        output, state = await asyncio.shield(future)
+        return self._finish_check(key, use_cache, output, state)
+
+    @staticmethod
+    def _classify(output: str) -> tuple:
+        """Maps cargo check output to (tool output, resulting task state or None)."""
+        if _FINISHED_RE.search(output):
+            if _ERROR_RE.search(output):
+                return output, None
+            return _SUCCESS_OUTPUT, "success"
+        else:
+            return output, "failed"
+
+    async def _acargo_check(self, rust_project_path: str) -> tuple:
+        """Runs cargo check in an asyncio subprocess; same result shape as _cargo_check."""
+        if not os.path.isdir(rust_project_path):
+            return self._classify(f"Error: Execution environment directory does not exist: {rust_project_path}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "cargo", "check",
+                cwd=rust_project_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+            try:
+                out, _ = await asyncio.wait_for(proc.communicate(), timeout=_CARGO_CHECK_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return self._classify(f"Running error: cargo check timed out after {_CARGO_CHECK_TIMEOUT}s")
+        except Exception as e:
+            return self._classify(f"Running error: {e}")
+        return self._classify(clean_cmd_output(out.decode("utf-8", errors="replace")))
+
+    def _cargo_check(self, rust_project_path: str) -> tuple:
+        """Runs cargo check and returns (tool output, resulting task state or None)."""
         raw_output = run_cmd(['cargo', 'check'], exe_env=rust_project_path)
         if not isinstance(raw_output, str):
             output = str(raw_output)
         else:
             output = raw_output
 
-        error_pattern = re.compile(r'error(\[|:)', re.IGNORECASE)
-        finished_pattern = re.compile(r'Finished\s+`dev`\s+profile', re.IGNORECASE)
-
-        if finished_pattern.search(output):
-            if error_pattern.search(output):
-                return output
-            if self.task_state:
-                self.task_state.set_success("cargo_check")
-            return "The rust project is executable."
-        else:
-            if self.task_state:
-                self.task_state.set_failed("cargo_check")
-            return output
+        return self._classify(output)
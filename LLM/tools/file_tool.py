@@ -1,10 +1,14 @@
+import functools
+import mmap
 import pathlib
 import shutil
+import tempfile
+from array import array
 from typing import Callable, Optional
-from langchain.tools import tool
 from unidiff import PatchSet
+from unidiff.constants import LINE_TYPE_ADDED, LINE_TYPE_CONTEXT
 import os
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from langchain_core.tools.base import ArgsSchema
 from langchain_core.tools import BaseTool
 from utils import file_utils
@@ -24,12 +28,39 @@ class ListProjectStructureTool(BaseTool):
     relationships between different folders and files.
     '''
     project_root_path: str
+    # (directory mtime fingerprint, tree string) of the last listing
+    _tree_cache: Optional[tuple] = PrivateAttr(default=None)
 
     def __init__(self, project_root_path: str, **kwargs):
         super().__init__(project_root_path=project_root_path, **kwargs)
 
     def _run(self) -> str:
-        return file_utils.build_recursive_directory_tree_string(self.project_root_path)
+        # The tree only changes when an entry is added, removed or renamed, which bumps the
+        # mtime of its directory; a stat pass over the directories is enough to detect it.
+        fingerprint = _directory_mtimes(self.project_root_path)
+        if self._tree_cache is not None and self._tree_cache[0] == fingerprint:
+            return self._tree_cache[1]
+        tree = file_utils.build_recursive_directory_tree_string(self.project_root_path)
+        self._tree_cache = (fingerprint, tree)
+        return tree
+
+
+def _directory_mtimes(root: str) -> tuple:
+    """mtimes of ``root`` and every directory below it that the tree listing descends into."""
+    mtimes = []
+    stack = [root]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            mtimes.append((current_dir, os.stat(current_dir).st_mtime_ns))
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    # build_recursive_directory_tree_string skips 'build' and 'target'
+                    if entry.name not in ('build', 'target') and entry.is_dir():
+                        stack.append(entry.path)
+        except OSError:
+            mtimes.append((current_dir, None))
+    return tuple(mtimes)
 
 
 class ReadFileInput(BaseModel):
@@ -99,14 +130,18 @@ class WriteFileToolPermissions(BaseTool):
     project_root_path: str
     can_write_checker: Optional[Callable[[pathlib.Path], bool]] = None
 
+    _resolved_root: str = PrivateAttr()
+
     def __init__(self, project_root_path: str, can_write_checker: Optional[Callable[[pathlib.Path], bool]] = None, **kwargs):
         super().__init__(project_root_path=project_root_path, can_write_checker=can_write_checker, **kwargs)
+        # Resolved once; used by the outside-root check on every call
+        self._resolved_root = str(pathlib.Path(project_root_path).resolve())
 
     def _run(self, path: str, content: str) -> str:
         relative_path = pathlib.Path(path)
         full_path = (pathlib.Path(self.project_root_path) / relative_path).resolve()
         
-        if not str(full_path).startswith(str(pathlib.Path(self.project_root_path).resolve())):
+        if not str(full_path).startswith(self._resolved_root):
             return "Access outside root directory is not allowed."
         
         if self.can_write_checker and not self.can_write_checker(relative_path):
@@ -121,6 +156,65 @@ class WriteFileToolPermissions(BaseTool):
             return f"Error writing file {path}: {e}"
 
 
+@functools.lru_cache(maxsize=64)
+def _diff_header(file_path: str) -> str:
+    return f"--- {file_path}\n+++ {file_path}\n"
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_patch(file_path: str, diff_content: str) -> PatchSet:
+    """
+    Parse a simplified diff (hunks only) for ``file_path``. Retried identical diffs reuse the parse;
+    the returned PatchSet is only read, never modified.
+    """
+    wrapped = _diff_header(file_path) + diff_content
+    return PatchSet(wrapped.splitlines(keepends=True))
+
+
+# Hunk lines that end up in the patched file
+_KEPT_LINE_TYPES = (LINE_TYPE_CONTEXT, LINE_TYPE_ADDED)
+# Files above this size are patched through an mmap line index instead of readlines()
+_MMAP_PATCH_THRESHOLD = 8 * 1024 * 1024
+
+
+def _apply_hunks_mmap(full_path: pathlib.Path, hunks: list) -> None:
+    """
+    Apply ``hunks`` (sorted by source_start, descending) to a large file without splitting it into lines.
+
+    Line start offsets are indexed over an mmap of the file; the untouched spans are copied as bytes
+    around the replacement lines into a temporary file that then replaces the original.
+    """
+    with open(full_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        offsets = array("Q", [0])
+        pos = mm.find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = mm.find(b"\n", pos + 1)
+        if offsets[-1] != size:
+            offsets.append(size)  # last line without a trailing newline
+        line_count = len(offsets) - 1
+
+        fd, tmp_path = tempfile.mkstemp(dir=full_path.parent, prefix=f".{full_path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                copied_until = 0  # line index up to which the original has been written
+                for hunk in reversed(hunks):
+                    start = min(max(hunk.source_start - 1, 0), line_count)
+                    end = min(start + hunk.source_length, line_count)
+                    out.write(mm[offsets[copied_until]:offsets[max(start, copied_until)]])
+                    out.write("".join(
+                        line.value for line in hunk if line.line_type in _KEPT_LINE_TYPES
+                    ).encode("utf-8"))
+                    copied_until = max(end, copied_until)
+                out.write(mm[offsets[copied_until]:])
+            shutil.copymode(full_path, tmp_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, full_path)
+
+
 class ApplyDiffInput(BaseModel):
     diff: str = Field(description="Simplified unified diff content")
     path: str = Field(description="Path to the file relative to project root")
@@ -176,15 +270,19 @@ class ApplyDiffTool(BaseTool):
     project_root_path: str
     can_write_checker: Optional[Callable[[pathlib.Path], bool]] = None
 
+    _resolved_root: str = PrivateAttr()
+
     def __init__(self, project_root_path: str, can_write_checker: Optional[Callable[[pathlib.Path], bool]] = None):
         super().__init__(project_root_path=project_root_path, can_write_checker=can_write_checker)
+        # Resolved once; used by the outside-root check on every call
+        self._resolved_root = str(pathlib.Path(project_root_path).resolve())
 
     def _run(self, diff: str, path: str) -> str:
         relative_path = pathlib.Path(path)
         full_path = (pathlib.Path(self.project_root_path) / relative_path).resolve()
 
         # Security check
-        if not str(full_path).startswith(str(pathlib.Path(self.project_root_path).resolve())):
+        if not str(full_path).startswith(self._resolved_root):
             return "Access outside root directory is not allowed."
         
         if self.can_write_checker and not self.can_write_checker(relative_path):
@@ -194,51 +292,57 @@ class ApplyDiffTool(BaseTool):
             return f"File {path} not found relative to root directory."
         
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                original_lines = f.readlines()
-        except Exception as e:
-            return f"Error reading file {path}: {e}"
-
-        # Wrap the simplified diff in proper unified diff format
-        wrapped_diff = self._wrap_diff(diff, path)
-        
-        try:
-            patch = PatchSet(wrapped_diff.splitlines(keepends=True))
+            patch = _parse_patch(path, diff)
         except Exception as e:
             return f"Error parsing diff: {e}"
 
-        # Apply the patch
-        new_lines = original_lines[:]
-        
+        # Hunk positions refer to the original file, so splice from the bottom up:
+        # earlier hunks then keep their offsets and the lines can be patched in place.
+        hunks = sorted(
+            (hunk for patched_file in patch for hunk in patched_file),
+            key=lambda hunk: hunk.source_start,
+            reverse=True,
+        )
+
         try:
-            for patched_file in patch:
-                for hunk in patched_file:
+            large_file = os.path.getsize(full_path) > _MMAP_PATCH_THRESHOLD
+        except OSError as e:
+            return f"Error reading file {path}: {e}"
+        if large_file:
+            try:
+                _apply_hunks_mmap(full_path, hunks)
+                return f"Diff applied successfully to {path}."
+            except Exception as e:
+                return f"Error applying diff to {path}: {e}"
+
+        # Read, patch and rewrite through a single handle
+        try:
+            f = open(full_path, "r+", encoding="utf-8")
+        except Exception as e:
+            return f"Error reading file {path}: {e}"
+        with f:
+            try:
+                new_lines = f.readlines()
+            except Exception as e:
+                return f"Error reading file {path}: {e}"
+
+            try:
+                for hunk in hunks:
                     # Convert 1-indexed to 0-indexed
                     start_index = hunk.source_start - 1
                     end_index = start_index + hunk.source_length
-                    
-                    # Build new content for this hunk
-                    new_hunk_lines = []
-                    for line in hunk:
-                        if line.is_context or line.is_added:
-                            new_hunk_lines.append(line.value)
-                    
-                    # Replace the block
-                    new_lines[start_index:end_index] = new_hunk_lines
 
-            with open(full_path, "w", encoding="utf-8") as f:
-                f.writelines(new_lines)
-            return f"Diff applied successfully to {path}."
-        except Exception as e:
-            return f"Error applying diff to {path}: {e}"
+                    # Replace the block with the context and added lines of this hunk
+                    new_lines[start_index:end_index] = [
+                        line.value for line in hunk if line.line_type in _KEPT_LINE_TYPES
+                    ]
 
-    def _wrap_diff(self, diff_content: str, file_path: str) -> str:
-        """
-        Wrap simplified diff content in proper unified diff format
-        """
-        # Add the file header that unidiff expects
-        wrapped = f"--- {file_path}\n+++ {file_path}\n{diff_content}"
-        return wrapped
+                f.seek(0)
+                f.truncate()
+                f.write("".join(new_lines))
+                return f"Diff applied successfully to {path}."
+            except Exception as e:
+                return f"Error applying diff to {path}: {e}"
 
 class ListProjectContentTool(BaseTool):
     """
@@ -261,30 +365,53 @@ class ListProjectContentTool(BaseTool):
 
     def _run(self) -> str:
         output = []
-        src_prefix = os.path.join('src', '')
-        for root, _, files in os.walk(self.project_root_path):
-            rel_root = os.path.relpath(root, self.project_root_path)
-            if not (rel_root == 'src' or rel_root.startswith(src_prefix)):
+        for entry, rel_path in _walk_src(self.project_root_path):
+            # Only .java and .cs sources are listed
+            if not entry.name.endswith(_SOURCE_SUFFIXES):
                 continue
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, self.project_root_path)
-                # Corrected logic: only process .java or .cs files
-                if not (rel_path.endswith(".java") or rel_path.endswith(".cs")):
-                    continue
-
-                if rel_path.startswith(src_prefix):
-                    output.append(f"  File: {rel_path}")
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        indented_content = "\n".join("    " + line for line in content.splitlines())
-                        output.append(indented_content)
-                    except Exception as e:
-                        output.append(f"    Error reading file {rel_path}: {e}")
+            output.append(f"  File: {rel_path}")
+            try:
+                with open(entry.path, "rb") as f:
+                    raw = f.read()
+                # Indent at the byte level and decode once, instead of per line
+                raw = raw.replace(b"\r\n", b"\n")
+                if raw.endswith(b"\n"):
+                    raw = raw[:-1]
+                indented_content = (
+                    (b"    " + raw.replace(b"\n", b"\n    ")).decode("utf-8", errors="replace")
+                    if raw else ""
+                )
+                output.append(indented_content)
+            except Exception as e:
+                output.append(f"    Error reading file {rel_path}: {e}")
         return "\n".join(output)
 
+_SOURCE_SUFFIXES = (".java", ".cs")
+_SKIP_DIRS = frozenset({".git", "target", "node_modules"})
+
+def _walk_src(project_root_path: str):
+    """
+    Yield ``(DirEntry, relative path)`` for every file under ``<project_root>/src``.
+
+    Files of a directory come before its subdirectories, matching ``os.walk`` order.
+    """
+    stack = [(os.path.join(project_root_path, "src"), "src")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    subdirs.append((entry.path, f"{rel_dir}{os.sep}{entry.name}"))
+            else:
+                yield entry, f"{rel_dir}{os.sep}{entry.name}"
+        stack.extend(reversed(subdirs))
+
 def create_permission_checker(fileconfig: dict[str, str]) -> Callable:
     """
     Creates a permission checker to verify write permissions for specific paths.
@@ -298,32 +425,25 @@ def create_permission_checker(fileconfig: dict[str, str]) -> Callable:
 
     Example:
         >>> checker = create_permission_checker({"src/": "rw", "docs/": "r"})
-        >>> checker(pathlib.Path("/home/user/src/main.py"))  # Returns True
+        >>> checker(pathlib.Path("src/main.py"))  # Returns True
     """
-    perm_map = {pathlib.Path(p): perm.lower() for p, perm in fileconfig.items()}
+    # (prefix, permission) pairs, longest prefix first so the first match is the most specific.
+    # A prefix matches the path itself and everything below it; "." (or "") matches every path.
+    entries = []
+    for p, perm in fileconfig.items():
+        prefix = pathlib.PurePath(p).as_posix()
+        entries.append(("" if prefix == "." else prefix, perm.lower()))
+    entries.sort(key=lambda entry: len(entry[0]), reverse=True)
 
     def can_write(relative_path: pathlib.Path) -> bool:
         """
-        Check if the specified path has write permission, distinguishing between directory and file permissions, prioritizing the most specific (longest path) permission configuration
+        Check if the specified path has write permission, using the most specific (longest path) permission configuration.
+        Paths not covered by any entry are not writable.
         """
-        best_match_len = -1
-        best_perm = None
-        for config_path, perm in perm_map.items():
-            is_dir = str(config_path).endswith(os.sep)
-            
-            match_len = 0
-            if is_dir:
-                if config_path in relative_path.parents or config_path == relative_path:
-                    match_len = len(str(config_path))
-            elif config_path == relative_path:
-                match_len = len(str(config_path))
-
-            if match_len > best_match_len:
-                best_match_len = match_len
-                best_perm = perm
-        
-        return best_perm == "rw"
+        rel_str = pathlib.PurePath(relative_path).as_posix()
+        for prefix, perm in entries:
+            if not prefix or rel_str == prefix or rel_str.startswith(prefix + "/"):
+                return perm == "rw"
+        return False
 
     return can_write
-
-
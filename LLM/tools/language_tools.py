@@ -1,125 +1,470 @@
+import asyncio
+import functools
 import re
 import os
 from langchain_core.tools.base import ArgsSchema
-from pydantic.config import ConfigDict
 import toml
 from loguru import logger
-from typing import Any, Dict, List,Optional, Union
+from typing import Any, Callable, Dict, List,Optional, Union
+import shutil
+import signal
 import subprocess # Replace pexpect with subprocess
-from jinja2 import Environment, FileSystemLoader
+import threading
+import time
+from collections import OrderedDict
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from LLM.states.task_states import TaskState
 from analyzers.python.python_analyzer import PythonCoverageAnalyzer
 from analyzers.java.jacoco_analyzer import JacocoAnalyzer
 from utils import file_utils
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from langchain_core.tools import BaseTool
 
+_TEST_SUMMARY_RE = re.compile(
+    r"Tests run:\s*(\d+),\s*Failures:\s*(\d+),\s*Errors:\s*(\d+),\s*Skipped:\s*(\d+)"
+)
+_SIMPLE_TESTS_RUN_RE = re.compile(r"Tests run:\s*(\d+)")
+# Maven's generic help text that follows a compilation failure
+_INVALID_PHRASES = (
+    "To see the full stack trace of the errors, re-run Maven with the -e switch.",
+    "Re-run Maven using the -X switch to enable full debug logging.",
+    "For more information about the errors and possible solutions, please read the following articles:",
+    "[Help 1] http://cwiki.apache.org/confluence/display/MAVEN/MojoFailureException",
+)
+_INVALID_PHRASE_RE = re.compile("|".join(re.escape(phrase) for phrase in _INVALID_PHRASES))
+_PYTEST_ERRORS_RE = re.compile(r"={10,}\s+ERRORS\s+={10,}(.*?)={10,}", re.DOTALL)
+_PYTEST_FAILURES_RE = re.compile(r"={10,}\s+FAILURES\s+={10,}(.*?)={10,}", re.DOTALL)
+_PYTEST_SUMMARY_RE = re.compile(r"={10,}\s((?:\d+\s\w+,\s)*\d+\s\w+)\sin\s[\d\.]+s\s={10,}")
+_CAMEL_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_BOUNDARY_RE = re.compile('([a-z0-9])([A-Z])')
+
+# The Maven daemon keeps a warm JVM and resolved dependencies between builds; fall back to mvn.
+# Resolved once to an absolute path: the builds are exec'd directly, without a shell.
+_MAVEN = shutil.which("mvnd") or shutil.which("mvn") or "mvn"
+# Builds are short-lived, so C1-only JIT starts faster than tiered compilation up to C2
+_MAVEN_OPTS = "-XX:+TieredCompilation -XX:TieredStopAtLevel=1"
+
+
+_JACOCO_COMMAND = [_MAVEN, "test", "jacoco:report", "-T", "1C"]
+# Used when classes of removed sources may still be in target/ and would be run by surefire
+_JACOCO_CLEAN_COMMAND = [_MAVEN, "clean", "test", "jacoco:report", "-T", "1C"]
+_JACOCO_REPORTS = frozenset(("jacoco.csv", "jacoco.xml"))
+# Upper bound on the build output handed to the ANSI stripper and the error-line scan
+_MAX_OUTPUT_BYTES = 8 << 20
+# Error lines of a unit test run kept for the agent; the rest are only counted
+_MAX_ERROR_LINES = 200
+# Parsed coverage reports keyed on (path, parser, mtime_ns, size), least recently used first
+_COVERAGE_CACHE: "OrderedDict[tuple, Any]" = OrderedDict()
+_COVERAGE_CACHE_LOCK = threading.Lock()
+_COVERAGE_CACHE_SIZE = 32
+# asyncio's default 64 KiB line limit is too small for some Maven log lines
+_STREAM_LINE_LIMIT = 1 << 20
+
+
+def _maven_env() -> dict:
+    """Environment for Maven builds, keeping any MAVEN_OPTS the user already set."""
+    maven_opts = os.environ.get("MAVEN_OPTS")
+    return {**os.environ, "MAVEN_OPTS": f"{maven_opts} {_MAVEN_OPTS}" if maven_opts else _MAVEN_OPTS}
+
 
 class MavenExecuteUnitTestTool(BaseTool):
     name: str = "execute_unit_test"
     description: str = '''
     Executes specified Java unit tests using Maven within the project path.
     Optional
-    This tool runs the 'mvn clean test' command. 'Tests run: X, Failures: 0, Errors: 0, Skipped: 0' means unit test pass without error, where X is the number of tests run.
+    This tool runs the Maven 'test' goal. 'Tests run: X, Failures: 0, Errors: 0, Skipped: 0' means unit test pass without error, where X is the number of tests run.
     It captures the command output, removes ANSI escape codes, and checks for lines containing '[ERROR]'.
     If errors are found, it returns the error lines; otherwise, it returns a success message.
     '''
 
     project_root_path:str
     task_state: TaskState | None = None
+    # Always run 'clean' before 'test'. Otherwise it only runs when classes of removed
+    # sources may be left in target/; the compiler plugin recompiles changed sources.
+    use_clean: bool = False
+    # (source fingerprint, output, task state) of the last completed run
+    _last_run: Optional[tuple] = PrivateAttr(default=None)
+    # Source paths of the last build this tool ran, None before its first build
+    _built_sources: Optional[frozenset] = PrivateAttr(default=None)
 
     def __init__(self, project_root_path: str, task_state: TaskState | None = None, **kwargs):
         super().__init__(project_root_path = project_root_path, task_state = task_state, **kwargs)
 
-    def _extract_error_lines(self, output: str, project_path: str) -> str:
-            """Extract meaningful error lines from Maven output, filtering out helper messages."""
-            error_lines = []
-            for line in output.splitlines():
-                if "[ERROR]" in line or line.startswith("Caused by"):
-                    cleaned_line = line.replace(f"{project_path}/", "")
-                    error_lines.append(cleaned_line)
-
-            return "\n".join(error_lines) if error_lines else ""
-
-    def _extract_success_message(self, output: str) -> str:
-            """Extract a success message from Maven output."""
-            build_success_match = re.search(r"\\[INFO\\] BUILD SUCCESS", output)
-            test_summary_match = re.search(
-                r"Tests run:\\s*(\\d+),\\s*Failures:\\s*(\\d+),\\s*Errors:\\s*(\\d+),\\s*Skipped:\\s*(\\d+)",
-                output,
-            )
-
-            if build_success_match and test_summary_match:
-                groups = test_summary_match.groups()
-                return f"Summary: Tests run: {groups[0]}, Failures: {groups[1]}, Errors: {groups[2]}, Skipped: {groups[3]}"
-            elif build_success_match:
-                return "Successfully ran tests."
-            else:
-                simple_test_summary = re.search(r"Tests run:\\s*(\\d+)", output)
-                if simple_test_summary:
-                    return f"Summary: Tests run: {simple_test_summary.group(1)}"
-                return ""
-
+    def _apply_state(self, state: str | None) -> None:
+        if self.task_state is None or state is None:
+            return
+        if state == "success":
+            self.task_state.set_success("unit_test")
+        else:
+            self.task_state.set_failed("unit_test")
+
+    @staticmethod
+    def _classify(scan: "_MavenTestOutput", exit_status: int) -> tuple:
+        """Maps a finished scan of the Maven output to (tool output, resulting task state or None)."""
+        if not scan.seen_output:
+            if exit_status != 0:
+                return f"Unit test execution failed (exit status {exit_status}). No output.", "failed"
+            return "(no significant output captured).", "success"
+
+        if scan.error_lines:
+            return "Unit test execution finished with errors:\n" + scan.error_report(), None
+        elif exit_status != 0:
+            return f"Unit test execution failed (exit status {exit_status}). Check logs or full output for details.", None
+
+        return scan.success_message() or "Unit test pass. ", "success"
+
+    def _command(self, fingerprint: tuple) -> List[str]:
+        # Surefire would still run the stale classes of removed or renamed tests
+        sources = frozenset(entry[0] for entry in fingerprint)
+        needs_clean = (self.use_clean or self._built_sources is None
+                       or not self._built_sources.issubset(sources))
+        self._built_sources = sources
+        if needs_clean:
+            return [_MAVEN, "clean", "test", "-T", "1C"]
+        return [_MAVEN, "test", "-T", "1C"]
+
+    def _replay(self, fingerprint: tuple) -> str | None:
+        """Returns the last output again if the sources have not changed since that run."""
+        if self._last_run is None or self._last_run[0] != fingerprint:
+            return None
+        logger.debug("Sources unchanged since the last unit test run in {}", self.project_root_path)
+        _, output, state = self._last_run
+        self._apply_state(state)
+        return output
+
+    def _finish(self, fingerprint: tuple, scan: "_MavenTestOutput", exit_status: int) -> str:
+        output, state = self._classify(scan, exit_status)
+        # A run killed by a signal says nothing about the sources, so it is never replayed
+        if exit_status >= 0:
+            self._last_run = (fingerprint, output, state)
+        self._apply_state(state)
+        return output
 
     def _run(self) -> str:
-         command = ""  # Initialize for exception handling
-         try:
-             command = "mvn clean test"
-             logger.debug(f"Executing command: {command} in {self.project_root_path}")
+         fingerprint = _source_fingerprint(self.project_root_path)
+         replayed = self._replay(fingerprint)
+         if replayed is not None:
+             return replayed
+         command = self._command(fingerprint)
 
-             process = subprocess.run(
+         logger.debug(f"Executing command: {' '.join(command)} in {self.project_root_path}")
+         try:
+             # Stream the merged stdout/stderr so the log is scanned once, line by line,
+             # instead of being buffered twice and re-scanned for errors and the summary.
+             process = subprocess.Popen(
                  command,
                  cwd=self.project_root_path,
-                 capture_output=True,
-                 text=True,
-                 shell=True,
-                 timeout=300,
+                 stdout=subprocess.PIPE,
+                 stderr=subprocess.STDOUT,
+                 start_new_session=True,
+                 env=_maven_env(),
              )
-             output = process.stdout + "\n" + process.stderr  # Combine stdout and stderr
-             exit_status = process.returncode
-
-             if output:
-                 ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-                 cleaned_output = ansi_escape.sub("", output)
-
-                 error_lines = self._extract_error_lines(
-                     cleaned_output, self.project_root_path
-                 )
-
-                 if error_lines:
-                     return f"Unit test execution finished with errors:\n{error_lines}"
-                 elif exit_status != 0:
-                     return f"Unit test execution failed (exit status {exit_status}). Check logs or full output for details."
-                 else:
-                     success_message = self._extract_success_message(cleaned_output)
-                     if success_message:
-                         if self.task_state:
-                             self.task_state.set_success("unit_test")
-                         return success_message
-                     else:
-                         if self.task_state:
-                             self.task_state.set_success("unit_test")
-                         return "Unit test pass. "
-
-             elif exit_status != 0:
-                 if self.task_state:
-                     self.task_state.set_failed("unit_test")
-                 err_output = process.stderr.strip()
-                 return f"Unit test execution failed (exit status {exit_status}).{' Output: ' + err_output if err_output else ' No output.'}"
-             else:
-                 if self.task_state:
-                     self.task_state.set_success("unit_test")
-                 return "(no significant output captured)."
-
-         except subprocess.TimeoutExpired:
-             logger.error(f"Command '{command}' timed out after 300 seconds.")
-             return "Error: Command execution timed out."
+             # Kill the whole group: the mvn launcher script may leave a JVM holding the pipe.
+             # The flag is set before the kill, as Timer.finished is only set once it returns.
+             timed_out = threading.Event()
+
+             def on_timeout() -> None:
+                 timed_out.set()
+                 _kill_process_group(process)
+
+             timer = threading.Timer(300, on_timeout)
+             timer.start()
+             try:
+                 scan = _MavenTestOutput(self.project_root_path)
+                 for line in process.stdout:
+                     scan.feed(line)
+                 exit_status = process.wait()
+             finally:
+                 timer.cancel()
+                 # Reading the output can fail as well; do not leave Maven running then
+                 if process.poll() is None:
+                     _kill_process_group(process)
+                     process.wait()
+
+             if timed_out.is_set():
+                 logger.error(f"Command '{' '.join(command)}' timed out after 300 seconds.")
+                 return "Error: Command execution timed out."
+             return self._finish(fingerprint, scan, exit_status)
+
          except Exception as e:
              logger.exception(
                  "An unexpected error occurred during Java unit test execution"
              )
              return f"An unexpected error occurred during Java unit test execution: {e}"
 
+    async def _arun(self) -> str:
+        fingerprint = _source_fingerprint(self.project_root_path)
+        replayed = self._replay(fingerprint)
+        if replayed is not None:
+            return replayed
+        command = self._command(fingerprint)
+
+        logger.debug(f"Executing command: {' '.join(command)} in {self.project_root_path}")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=self.project_root_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,
+                env=_maven_env(),
+                limit=_STREAM_LINE_LIMIT,
+            )
+            scan = _MavenTestOutput(self.project_root_path)
+
+            async def consume() -> int:
+                async for line in process.stdout:
+                    scan.feed(line)
+                return await process.wait()
+
+            try:
+                exit_status = await asyncio.wait_for(consume(), timeout=300)
+            except asyncio.TimeoutError:
+                logger.error(f"Command '{' '.join(command)}' timed out after 300 seconds.")
+                return "Error: Command execution timed out."
+            finally:
+                # On a timeout, or if reading the output failed, do not leave Maven running
+                if process.returncode is None:
+                    _kill_process_group(process)
+                    await process.wait()
+            return self._finish(fingerprint, scan, exit_status)
+
+        except Exception as e:
+            logger.exception(
+                "An unexpected error occurred during Java unit test execution"
+            )
+            return f"An unexpected error occurred during Java unit test execution: {e}"
+
+def _source_fingerprint(project_root_path: str) -> tuple:
+    """
+    (path, mtime_ns, size) of every input the Maven tests depend on: the Java sources and
+    pom.xml, plus the Rust sources and Cargo.toml the linked tests call into.
+    """
+    entries = []
+    for build_file in ("pom.xml", os.path.join("rust", "Cargo.toml")):
+        try:
+            st = os.stat(os.path.join(project_root_path, build_file))
+        except OSError:
+            continue
+        entries.append((build_file, st.st_mtime_ns, st.st_size))
+
+    stack = [os.path.join(project_root_path, "src"), os.path.join(project_root_path, "rust", "src")]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        entries.append((entry.path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            continue
+    entries.sort()
+    return tuple(entries)
+
+
+def _cap_output(output: bytes) -> bytes:
+    """
+    Keeps at most the last _MAX_OUTPUT_BYTES of a build log before it is processed,
+    so runaway plugin output cannot stall the tool. Maven reports errors at the end.
+    """
+    if len(output) <= _MAX_OUTPUT_BYTES:
+        return output
+    return b"[truncated]\n" + output[-_MAX_OUTPUT_BYTES:]
+
+
+def _strip_ansi(buf: bytes) -> bytes:
+    """
+    Removes ANSI escape sequences from ``buf`` in one linear pass.
+
+    Plain text between escapes is located with bytes.find and copied in bulk; only the
+    sequences themselves are walked byte by byte. Recognised are two-byte escapes
+    (ESC followed by @-Z or \\-_) and CSI sequences (ESC [, parameter bytes 0-?,
+    intermediate bytes space-/, one final byte @-~). An ESC that starts neither is kept.
+    """
+    esc = buf.find(0x1B)
+    if esc < 0:
+        return buf
+    out = bytearray()
+    start = 0
+    n = len(buf)
+    while esc >= 0:
+        out += buf[start:esc]
+        i = esc + 1
+        end = -1
+        if i < n:
+            b = buf[i]
+            if b == 0x5B:  # '[': CSI
+                i += 1
+                while i < n and 0x30 <= buf[i] <= 0x3F:
+                    i += 1
+                while i < n and 0x20 <= buf[i] <= 0x2F:
+                    i += 1
+                if i < n and 0x40 <= buf[i] <= 0x7E:
+                    end = i + 1
+            elif 0x40 <= b <= 0x5F:
+                end = i + 1
+        if end < 0:
+            # Not an escape sequence: keep the ESC and resume right after it
+            out.append(0x1B)
+            end = esc + 1
+        start = end
+        esc = buf.find(0x1B, start)
+    out += buf[start:]
+    return bytes(out)
+
+
+def strip_ansi_str(text: str) -> str:
+    """str wrapper around _strip_ansi."""
+    if "\x1b" not in text:
+        return text
+    return _strip_ansi(text.encode("utf-8", errors="surrogateescape")).decode("utf-8", errors="surrogateescape")
+
+
+def _cached_parse(path: str, parse: Callable[[str], Any]) -> Any:
+    """
+    Returns parse(path), reusing the previous result while the file keeps the same
+    mtime and size. The results are shared, so callers must not modify them.
+    """
+    st = os.stat(path)
+    key = (path, parse.__qualname__, st.st_mtime_ns, st.st_size)
+    with _COVERAGE_CACHE_LOCK:
+        cached = _COVERAGE_CACHE.get(key)
+        if cached is not None:
+            _COVERAGE_CACHE.move_to_end(key)
+            return cached
+    result = parse(path)
+    with _COVERAGE_CACHE_LOCK:
+        _COVERAGE_CACHE[key] = result
+        while len(_COVERAGE_CACHE) > _COVERAGE_CACHE_SIZE:
+            _COVERAGE_CACHE.popitem(last=False)
+    return result
+
+
+def _dir_entry_names(dir_path: str) -> set:
+    """Names in ``dir_path``, or an empty set if it cannot be listed."""
+    try:
+        with os.scandir(dir_path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _written_since(dir_path: str, names: frozenset, since_ns: int) -> bool:
+    """
+    Whether every file in ``names`` exists in ``dir_path`` and was modified at or after
+    ``since_ns``. Compared in whole seconds, as file timestamps can lag the system clock.
+    """
+    for name in names:
+        try:
+            st = os.stat(os.path.join(dir_path, name))
+        except OSError:
+            return False
+        if st.st_mtime_ns // 1_000_000_000 < since_ns // 1_000_000_000:
+            return False
+    return True
+
+
+def _kill_process_group(process: subprocess.Popen | asyncio.subprocess.Process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def _arun_quiet(command: List[str], cwd: str, timeout: float) -> int:
+    """
+    Async counterpart of subprocess.run(command, timeout=...) with the output discarded;
+    raises subprocess.TimeoutExpired after killing the process group.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        cwd=cwd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+        start_new_session=True,
+        env=_maven_env(),
+    )
+    try:
+        return await asyncio.wait_for(process.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        _kill_process_group(process)
+        await process.wait()
+        raise subprocess.TimeoutExpired(command, timeout)
+
+
+class _MavenTestOutput:
+    """
+    Single-pass scan of `mvn test` output, keeping only the error lines and the test summary.
+    """
+
+    __slots__ = ("_project_prefix", "seen_output", "error_lines", "dropped_error_lines",
+                 "build_success", "summary", "tests_run")
+
+    def __init__(self, project_path: str):
+        self._project_prefix = f"{project_path}/"
+        self.seen_output = False
+        self.error_lines: List[str] = []
+        self.dropped_error_lines = 0
+        self.build_success = False
+        # Maven prints one summary per test class and the aggregate last; keep the last one
+        self.summary: Optional[tuple] = None
+        self.tests_run: Optional[str] = None
+
+    def feed(self, raw: bytes) -> None:
+        # Only the build footer follows BUILD SUCCESS; the caller still drains the pipe
+        if self.build_success:
+            return
+        raw = raw.rstrip(b"\r\n")
+        if not raw:
+            return
+        self.seen_output = True
+        if b"\x1b" in raw:
+            raw = _strip_ansi(_cap_output(raw))
+
+        # Filter on bytes so that only the few lines that are kept get decoded
+        if b"[ERROR]" in raw or raw.startswith(b"Caused by"):
+            if len(self.error_lines) < _MAX_ERROR_LINES:
+                line = raw.decode("utf-8", errors="replace")
+                self.error_lines.append(line.replace(self._project_prefix, ""))
+            else:
+                self.dropped_error_lines += 1
+        elif raw.startswith(b"[INFO] BUILD SUCCESS"):
+            self.build_success = True
+        elif b"Tests run:" in raw:
+            line = raw.decode("utf-8", errors="replace")
+            # Summaries follow the log level tag: "[INFO] Tests run: 5, Failures: 0, ..."
+            body = line.partition("] ")[2] if line.startswith("[") else line.lstrip()
+            if not body.startswith("Tests run:"):
+                return
+            summary_match = _TEST_SUMMARY_RE.match(body)
+            if summary_match:
+                self.summary = summary_match.groups()
+                self.tests_run = self.summary[0]
+            else:
+                simple_match = _SIMPLE_TESTS_RUN_RE.match(body)
+                if simple_match:
+                    self.tests_run = simple_match.group(1)
+
+    def error_report(self) -> str:
+        report = "\n".join(self.error_lines)
+        if self.dropped_error_lines:
+            report += f"\n... ({self.dropped_error_lines} more error lines omitted)"
+        return report
+
+    def success_message(self) -> str:
+        """Extract a success message from the scanned output."""
+        if self.build_success and self.summary:
+            groups = self.summary
+            return f"Summary: Tests run: {groups[0]}, Failures: {groups[1]}, Errors: {groups[2]}, Skipped: {groups[3]}"
+        elif self.build_success:
+            return "Successfully ran tests."
+        elif self.tests_run:
+            return f"Summary: Tests run: {self.tests_run}"
+        return ""
+
 class JacocoCoverageReport(BaseModel):
     line_coverage: float = Field(..., description="Overall line coverage percentage.")
     branch_coverage: float = Field(..., description="Overall branch coverage percentage.")
@@ -130,18 +475,83 @@ class JacocCoverageTool(BaseTool):
     name: str = "java_coverage"
     description: str = '''
     A tool for calculating JaCoCo code coverage for Java projects.
-    This tool executes the Maven command 'mvn clean test jacoco:report' to generate a JaCoCo report,
+    This tool executes the Maven command 'mvn test jacoco:report' to generate a JaCoCo report,
     then parses the generated XML report to extract line and branch coverage data.
     '''
 
     project_root_path:str
     task_state: TaskState | None = None
     coverage_history: List[List[float]] = Field(default_factory=list)
+    # Source fingerprint the reports under target/site/jacoco were generated from
+    _report_fingerprint: Optional[tuple] = PrivateAttr(default=None)
+    # Source paths of the last build this tool ran, None before its first build
+    _built_sources: Optional[frozenset] = PrivateAttr(default=None)
 
     def __init__(self, project_root_path: str, **kwargs):
         super().__init__(project_root_path = project_root_path, **kwargs)
 
 
+    def _prepare_build(self) -> tuple:
+        """
+        Returns (csv report path, xml report path, source fingerprint, Maven command or None).
+        The reports of the last run are still valid if no source changed since.
+        """
+        report_dir = os.path.join(self.project_root_path, "target", "site", "jacoco")
+        csv_report_path = os.path.join(report_dir, "jacoco.csv")
+        xml_report_path = os.path.join(report_dir, "jacoco.xml")
+
+        fingerprint = _source_fingerprint(self.project_root_path)
+        if (fingerprint == self._report_fingerprint
+                and _JACOCO_REPORTS.issubset(_dir_entry_names(report_dir))):
+            logger.debug("Sources unchanged since the last JaCoCo run in {}", self.project_root_path)
+            return csv_report_path, xml_report_path, fingerprint, None
+
+        # target/ may hold classes of sources removed since this tool last built (or, before
+        # its first build, from any earlier build), so only a clean build is safe then.
+        sources = frozenset(entry[0] for entry in fingerprint)
+        if self._built_sources is None or not self._built_sources.issubset(sources):
+            command = _JACOCO_CLEAN_COMMAND
+        else:
+            command = _JACOCO_COMMAND
+        self._built_sources = sources
+
+        logger.debug(f"Executing command: {' '.join(command)} in {self.project_root_path}")
+        self._report_fingerprint = None
+        # Even without 'clean', drop the execution data and the reports: the JaCoCo agent
+        # appends to the former, and a failed build must not leave the last run's reports behind.
+        for stale_path in (
+            os.path.join(self.project_root_path, "target", "jacoco.exec"),
+            csv_report_path,
+            xml_report_path,
+        ):
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+        return csv_report_path, xml_report_path, fingerprint, command
+
+    def _build_finished(
+        self, command: List[str], returncode: int, fingerprint: tuple, build_start_ns: int, report_dir: str
+    ) -> None:
+        """
+        Raises CalledProcessError for a failed build. The source fingerprint is only recorded,
+        letting later calls reuse the reports, once both were written by this build.
+        """
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+        if _written_since(report_dir, _JACOCO_REPORTS, build_start_ns):
+            self._report_fingerprint = fingerprint
+        else:
+            logger.warning("JaCoCo reports in {} were not regenerated by the build", report_dir)
+
+    def _build_failed(self, e: Exception) -> str:
+        logger.error(
+            f"Error during Maven command execution or report file check: {e}"
+        )
+        if self.task_state:
+            self.task_state.set_failed("coverage_pass")
+        return f"Error during Maven command execution or report file check: {e}"
+
     def _run(self) -> Union[JacocoCoverageReport, str]:
         """
         Executes JaCoCo coverage analysis.
@@ -152,46 +562,54 @@ class JacocCoverageTool(BaseTool):
             and detailed uncovered lines and branches by file.
         """
         try:
-            # Construct and execute the Maven command to generate the JaCoCo report
-            command = "mvn clean test jacoco:report"
-            logger.debug(f"Executing command: {command} in {self.project_root_path}")
-            try:
-                # Run the Maven command. If it times out, a TimeoutExpired exception will be caught.
-                subprocess.run(
+            csv_report_path, xml_report_path, fingerprint, command = self._prepare_build()
+            if command is not None:
+                build_start_ns = time.time_ns()
+                # Only the report files are used, so the build log is not captured at all
+                completed = subprocess.run(
                     command,
                     cwd=self.project_root_path,
-                    capture_output=True,
-                    text=True,
-                    shell=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                     timeout=300,
+                    env=_maven_env(),
                 )
-
-                # Parse the JaCoCo report
-                csv_report_path = os.path.join(
-                    self.project_root_path, "target", "site", "jacoco", "jacoco.csv"
-                )
-                xml_report_path = os.path.join(
-                    self.project_root_path, "target", "site", "jacoco", "jacoco.xml"
+                self._build_finished(
+                    command, completed.returncode, fingerprint, build_start_ns, os.path.dirname(csv_report_path)
                 )
-                if not os.path.exists(csv_report_path):
-                    if self.task_state:
-                        self.task_state.set_failed("coverage_pass")
-                    return "JaCoCo CSV report not found. May be code is not correct or empty. Run execute_unit_test at first."
-                if not os.path.exists(xml_report_path):
-                    if self.task_state:
-                        self.task_state.set_failed("coverage_pass")
-                    return "JaCoCo XML report not found. May be code is not correct or empty. Run execute_unit_test at first."
+        except Exception as e:
+            return self._build_failed(e)
+        return self._coverage_report(csv_report_path, xml_report_path)
 
-            except Exception as e:
-                logger.error(
-                    f"Error during Maven command execution or report file check: {e}"
+    async def _arun(self) -> Union[JacocoCoverageReport, str]:
+        try:
+            csv_report_path, xml_report_path, fingerprint, command = self._prepare_build()
+            if command is not None:
+                build_start_ns = time.time_ns()
+                returncode = await _arun_quiet(command, self.project_root_path, timeout=300)
+                self._build_finished(
+                    command, returncode, fingerprint, build_start_ns, os.path.dirname(csv_report_path)
                 )
-                if self.task_state:
-                    self.task_state.set_failed("coverage_pass")
-                return f"Error during Maven command execution or report file check: {e}"
+        except Exception as e:
+            return self._build_failed(e)
+        return self._coverage_report(csv_report_path, xml_report_path)
+
+    def _coverage_report(self, csv_report_path: str, xml_report_path: str) -> Union[JacocoCoverageReport, str]:
+        """Parses the JaCoCo reports and updates the coverage history and task state."""
+        # Both reports live in one directory; list it once instead of stat-ing each file
+        report_names = _dir_entry_names(os.path.dirname(csv_report_path))
+        if "jacoco.csv" not in report_names:
+            if self.task_state:
+                self.task_state.set_failed("coverage_pass")
+            return "JaCoCo CSV report not found. May be code is not correct or empty. Run execute_unit_test at first."
+        if "jacoco.xml" not in report_names:
+            if self.task_state:
+                self.task_state.set_failed("coverage_pass")
+            return "JaCoCo XML report not found. May be code is not correct or empty. Run execute_unit_test at first."
 
-            overall_coverage_data = JacocoAnalyzer.parse_jacoco_report(csv_report_path)
-            uncovered_data = JacocoAnalyzer.parse_jacoco_report_content(xml_report_path)
+        try:
+            overall_coverage_data = _cached_parse(csv_report_path, JacocoAnalyzer.parse_jacoco_report)
+            uncovered_data = _cached_parse(xml_report_path, JacocoAnalyzer.parse_jacoco_report_content)
 
             # Separate uncovered lines and branch uncovered lines
             uncovered_lines_by_file = {
@@ -234,11 +652,6 @@ class JacocCoverageTool(BaseTool):
 
             return report
 
-        except subprocess.TimeoutExpired:
-            logger.error("Command timed out after 300 seconds.")
-            if self.task_state:
-                self.task_state.set_failed("coverage_pass")
-            return "Error: Command execution timed out."
         except Exception as e:
             logger.exception(
                 "An unexpected error occurred during Java unit test execution"
@@ -263,19 +676,13 @@ class JavaCompileCheck(BaseTool):
 
     def _extract_error_lines(self, output: str, project_path: str) -> str:
             """Extract meaningful error lines from Maven output, filtering out helper messages."""
-            invalid_phrases = [
-                "To see the full stack trace of the errors, re-run Maven with the -e switch.",
-                "Re-run Maven using the -X switch to enable full debug logging.",
-                "For more information about the errors and possible solutions, please read the following articles:",
-                "[Help 1] http://cwiki.apache.org/confluence/display/MAVEN/MojoFailureException"
-            ]
-
+            prefix = f"{project_path}/"
             error_lines = []
             for line in output.splitlines():
                 if "[ERROR]" in line:
-                    if line.strip() == "[ERROR]" or any(phrase in line for phrase in invalid_phrases):
+                    if line.strip() == "[ERROR]" or _INVALID_PHRASE_RE.search(line) is not None:
                         continue
-                    cleaned_line = line.replace(f"{project_path}/", "")
+                    cleaned_line = line.replace(prefix, "")
                     error_lines.append(cleaned_line)
 
             return "\n".join(error_lines) if error_lines else ""
@@ -283,17 +690,18 @@ class JavaCompileCheck(BaseTool):
     def _run(self) -> str:
         command = "" # Initialize for exception handling
         try:
-            command = 'mvn compile'
+            command = f'{_MAVEN} compile -T 1C'
             logger.debug(f"Executing command: {command} in {self.project_root_path}")
+            argv = [_MAVEN, "compile", "-T", "1C"]
 
-            process = subprocess.run(command, cwd=self.project_root_path, capture_output=True, text=True, shell=True, timeout=300)
-            output = process.stdout + "\n" + process.stderr # Combine stdout and stderr
+            # Merge stderr into stdout in the pipe rather than concatenating the two afterwards
+            process = subprocess.run(argv, cwd=self.project_root_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=300, env=_maven_env())
+            output = process.stdout
             exit_status = process.returncode
 
 
             if output:
-                ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                cleaned_output = ansi_escape.sub('', output)
+                cleaned_output = _strip_ansi(_cap_output(output)).decode("utf-8", errors="replace")
 
                 error_lines = self._extract_error_lines(cleaned_output, self.project_root_path)
 
@@ -305,8 +713,7 @@ class JavaCompileCheck(BaseTool):
                     return "Java compilation successful."
 
             elif exit_status != 0:
-                err_output = process.stderr.strip()
-                return f"Java compilation failed with exit status {exit_status}.{' Error output: ' + err_output if err_output else ' No error output.'}"
+                return f"Java compilation failed with exit status {exit_status}. No error output."
             else:
                 return "Java compilation successful (no significant output captured)."
 
@@ -317,13 +724,71 @@ class JavaCompileCheck(BaseTool):
             logger.exception("An unexpected error occurred during Java compilation check")
             return f"An unexpected error occurred during Java compilation check: {e}"
 
+_RETURN_TYPE_GETTERS = {
+    'int': 'getAsInt',
+    'Integer': 'getAsInt',
+    'long': 'getAsLong',
+    'Long': 'getAsLong',
+    'double': 'getAsDouble',
+    'Double': 'getAsDouble',
+    'float': 'getAsFloat',
+    'Float': 'getAsFloat',
+    'boolean': 'getAsBoolean',
+    'Boolean': 'getAsBoolean',
+    'String': 'getAsString'
+}
+
+_JAVA_TO_RUST_TYPES = {
+    'int': 'i32',
+    'Integer': 'i32',
+    'byte[]': 'Vec<u8>',
+    'String': 'String',
+    'boolean': 'bool',
+    'Boolean': 'bool',
+    'double': 'f64',
+    'Double': 'f64',
+    'float': 'f32',
+    'Float': 'f32',
+    'long': 'i64',
+    'Long': 'i64'
+}
+
+def _java_to_rust_type(java_type: str) -> str:
+    """Convert Java type to Rust type."""
+    return _JAVA_TO_RUST_TYPES.get(java_type, 'String')
+
+
+@functools.lru_cache(maxsize=32)
+def _get_env(template_dir: str) -> Environment:
+    """
+    Returns the Environment shared by every TemplateForTrans for ``template_dir``.
+    The templates ship with the workspace and do not change while it runs, so Jinja2's
+    per-lookup mtime check is skipped, and compiled templates are kept in a bytecode
+    cache so later processes skip parsing them.
+    """
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+    env.filters['java_to_rust_type'] = _java_to_rust_type
+    return env
+
+
+@functools.lru_cache(maxsize=32)
+def _get_template(language: str, template_name: str, workspace_root: str) -> Template:
+    """
+    Returns the compiled link template, loaded once per process.
+    The templates are in the workspace's utils directory, not the dynamic project_root_path.
+    """
+    return _get_env(os.path.join(workspace_root, 'utils', language)).get_template(template_name)
+
 class TemplateForTransInput(BaseModel):
     function_name: str = Field(description="Name of the function to link")
     arguments: Dict[str, str] = Field(description="A dictionary mapping argument names to their Java types. For example: {'param1': 'String', 'param2': 'int'}")
     return_type: str = Field(description="Java return type of the function")
 
 class TemplateForTrans(BaseTool):
-    model_config = ConfigDict(extra='allow') # Allow extra fields for Jinja2 environments
     name: str = "create_template_for_transformation"
     args_schema: Optional[ArgsSchema] = TemplateForTransInput
     description: str = '''
@@ -332,27 +797,25 @@ class TemplateForTrans(BaseTool):
     '''
 
     project_root_path: str
-    java_env: Any = None
-    rust_env: Any = None
+    # Rendered code keyed on the template inputs; argument order is part of the key
+    _render_cache: Dict[tuple, str] = PrivateAttr(default_factory=dict)
 
     def __init__(self, project_root_path: str, **kwargs):
         super().__init__(project_root_path = project_root_path, **kwargs)
-        # The templates are in the workspace's utils directory, not the dynamic project_root_path
-        workspace_root = os.getcwd()
-        java_template_dir = os.path.join(workspace_root, 'utils', 'java')
-        rust_template_dir = os.path.join(workspace_root, 'utils', 'rust')
-        self.java_env = Environment(loader=FileSystemLoader(java_template_dir))
-        self.rust_env = Environment(loader=FileSystemLoader(rust_template_dir))
 
     def _generate_java_code(self, function_name: str, snake_case_function_name: str, arguments: Dict[str, str], return_type: str) -> str:
         """Generate Java code by adapting the template using Jinja2."""
+        cache_key = ('java', function_name, snake_case_function_name, tuple(arguments.items()), return_type)
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            template = self.java_env.get_template('java_link_template.jinja')
+            template = _get_template('java', 'java_link_template.jinja', os.getcwd())
 
             signature_params = [f"{param_type} {param_name}" for param_name, param_type in arguments.items()]
 
             getter_method = self._get_gson_getter_method(return_type)
-            return template.render(
+            code = template.render(
                 function_name=function_name,
                 snake_case_function_name=snake_case_function_name,
                 arguments=arguments,
@@ -360,6 +823,8 @@ class TemplateForTrans(BaseTool):
                 signature_params=', '.join(signature_params),
                 getter_method=getter_method
             )
+            self._render_cache[cache_key] = code
+            return code
         except Exception as e:
             logger.error(f"Failed to generate Java code with Jinja2: {e}")
             return ""
@@ -373,14 +838,20 @@ class TemplateForTrans(BaseTool):
             rust_arguments: Dictionary of argument names and their Rust types
             rust_return_type: Rust return type of the function
         """
+        cache_key = ('rust', function_name, tuple(rust_arguments.items()), rust_return_type)
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            template = self.rust_env.get_template('main.jinja')
+            template = _get_template('rust', 'main.jinja', os.getcwd())
 
-            return template.render(
+            code = template.render(
                 function_name=function_name,
                 arguments=rust_arguments,
                 return_type=rust_return_type
             )
+            self._render_cache[cache_key] = code
+            return code
         except Exception as e:
             logger.error(f"Failed to generate Rust code with Jinja2: {e}")
             return ""
@@ -406,8 +877,8 @@ class TemplateForTrans(BaseTool):
             java_code = self._generate_java_code(function_name, snake_case_function_name, arguments, return_type)
 
             # Convert Java types to Rust types for the Rust template
-            rust_arguments = {name: self._java_to_rust_type(j_type) for name, j_type in arguments.items()}
-            rust_return_type = self._java_to_rust_type(return_type)
+            rust_arguments = {name: _java_to_rust_type(j_type) for name, j_type in arguments.items()}
+            rust_return_type = _java_to_rust_type(return_type)
             rust_code = self._generate_rust_code(snake_case_function_name, rust_arguments, rust_return_type)
 
             if not java_code or not rust_code:
@@ -464,44 +935,13 @@ class TemplateForTrans(BaseTool):
 
     def _to_snake_case(self, name: str) -> str:
         """Convert a string from camelCase to snake_case."""
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        s1 = _CAMEL_WORD_RE.sub(r'\1_\2', name)
+        return _CAMEL_BOUNDARY_RE.sub(r'\1_\2', s1).lower()
 
     def _get_gson_getter_method(self, java_type: str) -> str:
         """Get the appropriate Gson getter method for a given Java type."""
-        getter_mapping = {
-            'int': 'getAsInt',
-            'Integer': 'getAsInt',
-            'long': 'getAsLong',
-            'Long': 'getAsLong',
-            'double': 'getAsDouble',
-            'Double': 'getAsDouble',
-            'float': 'getAsFloat',
-            'Float': 'getAsFloat',
-            'boolean': 'getAsBoolean',
-            'Boolean': 'getAsBoolean',
-            'String': 'getAsString'
-        }
         # Default to getAsString for complex types that will be deserialized from JSON string
-        return getter_mapping.get(java_type, 'getAsString')
-
-    def _java_to_rust_type(self, java_type: str) -> str:
-        """Convert Java type to Rust type."""
-        type_mapping = {
-            'int': 'i32',
-            'Integer': 'i32',
-            'byte[]': 'Vec<u8>',
-            'String': 'String',
-            'boolean': 'bool',
-            'Boolean': 'bool',
-            'double': 'f64',
-            'Double': 'f64',
-            'float': 'f32',
-            'Float': 'f32',
-            'long': 'i64',
-            'Long': 'i64'
-        }
-        return type_mapping.get(java_type, 'String')
+        return _RETURN_TYPE_GETTERS.get(java_type, 'getAsString')
 
 class PythonCoverageReport(BaseModel):
     line_coverage: float = Field(..., description="Overall line coverage percentage.")
@@ -531,36 +971,38 @@ class PytestExecuteUnitTestTool(BaseTool):
             logger.info(f"Shared venv not found at {shared_venv_path}, creating it in {project_base_path}.")
             try:
                 subprocess.run(
-                    "uv venv", # This will create .venv in the cwd
+                    ["uv", "venv"], # This will create .venv in the cwd
                     cwd=project_base_path,
                     capture_output=True,
                     text=True,
-                    shell=True,
                     check=True
                 )
             except subprocess.CalledProcessError as e:
                 return f"Failed to create shared virtual environment in {project_base_path}: {e.stderr}"
+            except FileNotFoundError as e:
+                return f"Failed to create shared virtual environment in {project_base_path}: {e}"
 
         pytest_executable = os.path.join(shared_venv_path, "bin/pytest")
-        command = f"PYTHONPATH=. {pytest_executable} test_sensitive_fun.py --cov --cov-branch --cov-report=xml"
+        command = [pytest_executable, "test_sensitive_fun.py", "--cov", "--cov-branch", "--cov-report=xml"]
 
         try:
             process = subprocess.run(
                 command,
                 cwd=self.project_root_path, # The test execution still happens in the hash_dir
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                shell=True,
                 timeout=300,
+                env={**os.environ, "PYTHONPATH": "."},
             )
             
-            output = process.stdout + process.stderr
+            output = process.stdout
             output = output.replace(f"{self.project_root_path}/", "")
 
             if process.returncode != 0 and "no tests ran" not in output:
                 self.task_state.set_failed("test_pass")
-                errors_match = re.search(r"={10,}\s+ERRORS\s+={10,}(.*?)={10,}", output, re.DOTALL)
-                failures_match = re.search(r"={10,}\s+FAILURES\s+={10,}(.*?)={10,}", output, re.DOTALL)
+                errors_match = _PYTEST_ERRORS_RE.search(output)
+                failures_match = _PYTEST_FAILURES_RE.search(output)
                 
                 error_content = ""
                 if errors_match:
@@ -573,14 +1015,13 @@ class PytestExecuteUnitTestTool(BaseTool):
                 
                 return f"Test execution failed. Full output:\n{output}"
 
-            summary_pattern = re.compile(r"={10,}\s((?:\d+\s\w+,\s)*\d+\s\w+)\sin\s[\d\.]+s\s={10,}")
-            summary_match = summary_pattern.search(output)
+            summary_match = _PYTEST_SUMMARY_RE.search(output)
 
             if summary_match:
                 summary = summary_match.group(1)
                 if "failed" in summary or "errors" in summary:
                     self.task_state.set_failed("test_pass")
-                    failures_match = re.search(r"={10,}\s+FAILURES\s+={10,}(.*?)={10,}", output, re.DOTALL)
+                    failures_match = _PYTEST_FAILURES_RE.search(output)
                     if failures_match:
                         return f"FAILURES:\n{failures_match.group(1).strip()}"
                     return f"Test failed: {summary}. No detailed failure report found."
@@ -630,15 +1071,16 @@ class PythonUVInstallTestTool(BaseTool):
             logger.info(f"Shared venv not found at {shared_venv_path}, creating it in {project_base_path}.")
             try:
                 subprocess.run(
-                    "uv venv", # This will create .venv in the cwd
+                    ["uv", "venv"], # This will create .venv in the cwd
                     cwd=project_base_path,
                     capture_output=True,
                     text=True,
-                    shell=True,
                     check=True
                 )
             except subprocess.CalledProcessError as e:
                 return f"Failed to create shared virtual environment in {project_base_path}: {e.stderr}"
+            except FileNotFoundError as e:
+                return f"Failed to create shared virtual environment in {project_base_path}: {e}"
 
         # Install dependencies into the shared venv, running from the project_base_path
         command = f". {shared_venv_path}/bin/activate && uv pip install {dependencies}"
@@ -647,14 +1089,15 @@ class PythonUVInstallTestTool(BaseTool):
             process = subprocess.run(
                 command,
                 cwd=self.project_root_path, # Run install from the project root
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
                 shell=True,
                 timeout=300,
                 executable="/bin/bash"
             )
             
-            output = process.stdout + process.stderr
+            output = process.stdout
             
             if process.returncode != 0:
                 return f"Failed to install dependencies. Return code: {process.returncode}. Output:\n{output}"
@@ -12,6 +12,9 @@ from typing import Optional
 from typing import Union
 from typing import DefaultDict, List, Dict
 
+# Report elements dropped as soon as they are complete while streaming jacoco.xml
+_CLEARED_TAGS = frozenset(('class', 'package', 'group'))
+
 class JacocoAnalyzer(BaseAnalyzer):
     """
     JaCoCo analyzer for Maven projects.
@@ -513,14 +516,19 @@ class JacocoAnalyzer(BaseAnalyzer):
         try:
             # Open the CSV and read the header
             with open(report_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
+                reader = csv.reader(f)
+                header = next(reader, [])
 
                 #  Ensure the required columns are present
                 required = {"LINE_MISSED", "LINE_COVERED",
                             "BRANCH_MISSED", "BRANCH_COVERED"}
-                if not required.issubset(set(reader.fieldnames or [])):
-                    missing = required - set(reader.fieldnames or [])
+                if not required.issubset(header):
+                    missing = required - set(header)
                     raise ValueError(f"CSV is missing columns: {missing}")
+                line_covered_idx = header.index("LINE_COVERED")
+                line_missed_idx = header.index("LINE_MISSED")
+                branch_covered_idx = header.index("BRANCH_COVERED")
+                branch_missed_idx = header.index("BRANCH_MISSED")
 
                 total_line_covered = 0
                 total_line_missed = 0
@@ -530,11 +538,11 @@ class JacocoAnalyzer(BaseAnalyzer):
                 # Iterate over all rows and sum up the coverage data
                 for row in reader:
                     try:
-                        total_line_covered += int(row["LINE_COVERED"])
-                        total_line_missed += int(row["LINE_MISSED"])
-                        total_branch_covered += int(row["BRANCH_COVERED"])
-                        total_branch_missed += int(row["BRANCH_MISSED"])
-                    except ValueError as ve:
+                        total_line_covered += int(row[line_covered_idx])
+                        total_line_missed += int(row[line_missed_idx])
+                        total_branch_covered += int(row[branch_covered_idx])
+                        total_branch_missed += int(row[branch_missed_idx])
+                    except (ValueError, IndexError) as ve:
                         logger.warning(f"Skipping row due to invalid integer conversion: {row}. Error: {ve}")
                         continue
 
@@ -603,16 +611,6 @@ class JacocoAnalyzer(BaseAnalyzer):
             logger.error(f"❌ Jacoco XML report not found at expected location: {xml_path}")
             return {}
 
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-        except ET.ParseError as e:
-            logger.error(f"❌ Failed to parse Jacoco XML report {xml_path}: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"❌ Unexpected error reading/parsing Jacoco XML {xml_path}: {e}", exc_info=True)
-            return {}
-
         # 5. Process coverage data
         coverage_data: DefaultDict[str, Dict[str, List[int]]] = defaultdict(lambda: {
             'uncovered': [],
@@ -622,22 +620,42 @@ class JacocoAnalyzer(BaseAnalyzer):
         files_skipped = 0
         files_excluded = 0 # New counter for files excluded due to no coverage
 
-        for package_element in root.findall('.//package'):
-            package_name = package_element.get('name')
-            if not package_name:
-                logger.warning("Found package element with no 'name' attribute, skipping.")
-                files_skipped += len(package_element.findall('sourcefile')) # Estimate skipped
-                continue
+        # Stream the report: each <sourcefile> is handled on its end event and then cleared,
+        # as is every finished <class>, <package> and <group>, so memory stays proportional
+        # to one package's entries rather than the whole report.
+        package_name = None
+        try:
+            for event, element in ET.iterparse(xml_path, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    if tag == 'package':
+                        package_name = element.get('name')
+                        if not package_name:
+                            logger.warning("Found package element with no 'name' attribute, skipping.")
+                    continue
+                if tag != 'sourcefile':
+                    # <class> entries (methods and counters) are not used, and a finished
+                    # <package> or <group> holds nothing else that is still needed
+                    if tag in _CLEARED_TAGS:
+                        element.clear()
+                    if tag == 'package':
+                        package_name = None
+                    continue
+
+                sourcefile = element
+                if not package_name:
+                    files_skipped += 1
+                    sourcefile.clear()
+                    continue
 
-            for sourcefile in package_element.findall('sourcefile'):
                 source_file_name = sourcefile.get('name')
                 if not source_file_name:
                     logger.warning(f"Found sourcefile element with no 'name' attribute in package '{package_name}', skipping.")
                     files_skipped += 1
+                    sourcefile.clear()
                     continue
 
                 try:
-                    # Determine if the file has any line or branch coverage
                     # Determine if the file has any line or branch coverage by checking counters
                     line_counter = sourcefile.find('counter[@type="LINE"]')
                     branch_counter = sourcefile.find('counter[@type="BRANCH"]')
@@ -654,27 +672,21 @@ class JacocoAnalyzer(BaseAnalyzer):
                     # This aligns with Coverlet and the expectation of copy_source_files
                     path_str = (Path(package_name.replace('.', '/')) / source_file_name).as_posix() # e.g., org/cryptomator/logging/LogbackConfiguratorFactory.java
 
-                    # Extract and sort uncovered lines safely
-                    uncovered_lines_int = sorted([int(nr) for line in sourcefile.findall('line') if int(line.get('mi', 0)) > 0 and (nr := line.get('nr')) is not None])
-
-                    # Extract and sort branch uncovered data
+                    # Collect uncovered lines and lines with missed branches in one pass
+                    uncovered_lines_int = []
                     branch_uncovered_lines_int = []
-
-                    # Process branch coverage data
-                    for line in sourcefile.findall('line'):
+                    for line in sourcefile.iterfind('line'):
                         nr = line.get('nr')
                         if not nr:
                             continue
                         nr_int = int(nr)
-
-                        # Get branch coverage data
-                        mb = line.get('mb', 0)  # missed branches
-
-                        if int(mb) > 0:
+                        if int(line.get('mi', 0)) > 0:
+                            uncovered_lines_int.append(nr_int)
+                        if int(line.get('mb', 0)) > 0:  # missed branches
                             branch_uncovered_lines_int.append(nr_int)
 
                     # Always populate the result dictionary for the file, even if no lines are covered
-                    coverage_data[path_str]['uncovered'] = uncovered_lines_int
+                    coverage_data[path_str]['uncovered'] = sorted(uncovered_lines_int)
                     coverage_data[path_str]['branch_uncovered'] = sorted(branch_uncovered_lines_int)
                     files_processed += 1
 
@@ -685,6 +697,14 @@ class JacocoAnalyzer(BaseAnalyzer):
                 except Exception as e:
                     logger.warning(f"❌ Unexpected error processing sourcefile '{source_file_name}' in package '{package_name}': {e}", exc_info=True)
                     files_skipped += 1
+                finally:
+                    sourcefile.clear()
+        except ET.ParseError as e:
+            logger.error(f"❌ Failed to parse Jacoco XML report {xml_path}: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"❌ Unexpected error reading/parsing Jacoco XML {xml_path}: {e}", exc_info=True)
+            return {}
 
         logger.info(f"Enhanced Jacoco report parsing complete. Processed entries for {files_processed} files, skipped {files_skipped} entries due to issues, excluded {files_excluded} files due to no coverage.")
         return dict(coverage_data)
@@ -3,8 +3,9 @@ import os
 import json
 from pathlib import Path
 from abc import abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import itertools
+import threading
 
 from loguru import logger
 import tree_sitter_java as tsjava
@@ -20,6 +21,23 @@ except Exception as e:
     JAVA_LANGUAGE = None
     PYTHON_LANGUAGE = None
 
+# Parsers are built once per language and shared by all analyzers: {lang_name: (language object, parser)}
+_PARSER_CACHE: Dict[str, tuple] = {}
+_PARSER_CACHE_LOCK = threading.Lock()
+
+
+def _get_parser(lang_name: str, lang_obj: Any) -> Parser:
+    """Return the cached tree-sitter parser for ``lang_obj``, creating it on first use."""
+    cached = _PARSER_CACHE.get(lang_name)
+    if cached is not None and cached[0] is lang_obj:
+        return cached[1]
+    with _PARSER_CACHE_LOCK:
+        cached = _PARSER_CACHE.get(lang_name)
+        if cached is None or cached[0] is not lang_obj:
+            cached = (lang_obj, Parser(Language(lang_obj)))
+            _PARSER_CACHE[lang_name] = cached
+    return cached[1]
+
 class ProgramCode(object):
     """Base class for program code analysis and processing."""
     
@@ -41,9 +59,10 @@ class ProgramCode(object):
         Raises:
             ValueError: If language is not supported or language module is not loaded
         """
-        if lang_name.lower() == "java":
+        lang_name = lang_name.lower()
+        if lang_name == "java":
             lang_obj = JAVA_LANGUAGE
-        elif lang_name.lower() == "python":
+        elif lang_name == "python":
             lang_obj = PYTHON_LANGUAGE
         else:
             raise ValueError(f"Unsupported language for tree-sitter: {lang_name}")
@@ -52,15 +71,15 @@ class ProgramCode(object):
             raise ValueError(f"Tree-sitter language module for {lang_name} is not loaded.")
 
         if self.parser is None or self.language_module != lang_obj:
-            self.parser = Parser(Language(lang_obj))
+            self.parser = _get_parser(lang_name, lang_obj)
             self.language_module = lang_obj
 
-    def parse(self, code: str, lang_name: str) -> Node:
+    def parse(self, code: Union[str, bytes], lang_name: str) -> Node:
         """
         Parse code into AST tree using tree-sitter.
 
         Args:
-            code (str): Source code string
+            code (Union[str, bytes]): Source code string, or its UTF-8 bytes
             lang_name (str): Programming language identifier
 
         Returns:
@@ -68,7 +87,8 @@ class ProgramCode(object):
         """
         self._load_language(lang_name)
         if self.parser:
-            return self.parser.parse(bytes(code, "utf8")).root_node
+            source = code if isinstance(code, bytes) else code.encode("utf-8")
+            return self.parser.parse(source).root_node
         else:
             raise RuntimeError("Tree-sitter parser not initialized.")
 
@@ -57,8 +57,7 @@ class JavaCode(ProgramCode):
                 
                 method_signatures.add(f"{method_name}:{param_count}")
             
-            for child in reversed(node.children):
-                stack.append(child)
+            stack.extend(reversed(node.children))
 
         # Second pass: Identify leaf methods
         for method_node in method_declarations:
@@ -68,12 +67,12 @@ class JavaCode(ProgramCode):
             current_param_count = len([c for c in parameters_node.children if c.type == "formal_parameter"]) if parameters_node else 0
             current_method_signature = f"{current_method_name}:{current_param_count}"
 
-            logger.debug(f"Processing method: {current_method_name}")
+            logger.debug("Processing method: {}", current_method_name)
 
             # Check for a method body
             body_node = method_node.child_by_field_name("body")
             if not body_node:
-                logger.debug(f"Skipping {current_method_name} because it has no method body")
+                logger.debug("Skipping {} because it has no method body", current_method_name)
                 continue
 
             # Corrected definitive check. The issue was a misunderstanding of the Java AST.
@@ -102,7 +101,7 @@ class JavaCode(ProgramCode):
                     break
 
             if has_annotation:
-                logger.debug(f"Skipping {current_method_name} because it has an annotation")
+                logger.debug("Skipping {} because it has an annotation", current_method_name)
                 continue
 
 
@@ -110,7 +109,7 @@ class JavaCode(ProgramCode):
             # Check for basic return type
             return_type_node = method_node.child_by_field_name("type")
             if return_type_node and not self._is_basic_java_type(return_type_node, code):
-                logger.debug(f"Skipping {current_method_name} due to non-basic return type")
+                logger.debug("Skipping {} due to non-basic return type", current_method_name)
                 continue # Not a leaf method if return type is not basic
             
             # Check for basic arguments
@@ -122,7 +121,7 @@ class JavaCode(ProgramCode):
                     break
             
             if not is_basic_args:
-                logger.debug(f"Skipping {current_method_name} due to non-basic arguments")
+                logger.debug("Skipping {} due to non-basic arguments", current_method_name)
                 continue # Not a leaf method if arguments are not basic
 
             # A method must be static to be truly self-contained and not rely on instance state.
@@ -140,7 +139,7 @@ class JavaCode(ProgramCode):
                         break
             
             if not is_static:
-                logger.debug(f"Skipping {current_method_name} because it is not a static method.")
+                logger.debug("Skipping {} because it is not a static method.", current_method_name)
                 continue
 
             has_user_method_calls = False
@@ -160,15 +159,14 @@ class JavaCode(ProgramCode):
                         called_method_signature = f"{called_method_name}:{called_param_count}"
 
                         if called_method_signature in method_signatures and called_method_signature != current_method_signature:
-                            logger.debug(f"Method {current_method_name} calls another user-defined method: {called_method_name}")
+                            logger.debug("Method {} calls another user-defined method: {}", current_method_name, called_method_name)
                             has_user_method_calls = True
                             break # Found a call to another user-defined method, not a leaf
                     
-                    for child in reversed(current_body_node.children):
-                        body_stack.append(child)
+                    body_stack.extend(reversed(current_body_node.children))
             
             if not has_user_method_calls:
-                logger.debug(f"Found leaf method: {current_method_name}")
+                logger.debug("Found leaf method: {}", current_method_name)
                 leaf_methods.append({
                     "code": self._node_text(method_node, code),
                     "file_path": file_path,
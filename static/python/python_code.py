@@ -63,7 +63,7 @@ class PythonCode(ProgramCode):
                 with open(file_path, 'r', encoding='utf-8') as file:
                     code = file.read()
                     file_contents[file_path] = code
-                tree = self.parser.parse(bytes(code, "utf8"))
+                tree = self.parser.parse(code.encode("utf-8"))
                 root_node = tree.root_node
                 file_trees[file_path] = root_node
                 
@@ -76,8 +76,7 @@ class PythonCode(ProgramCode):
                         if name_node:
                             all_function_names.add(self._node_text(name_node, code))
                     
-                    for child in reversed(node.children):
-                        stack.append(child)
+                    stack.extend(reversed(node.children))
             except Exception as e:
                 logger.error(f"Error in first pass processing file {file_path}: {e}")
 
@@ -110,8 +109,7 @@ class PythonCode(ProgramCode):
             node = stack.pop()
             if node.type == "function_definition":
                 function_definitions.append(node)
-            for child in reversed(node.children):
-                stack.append(child)
+            stack.extend(reversed(node.children))
 
         # If project-wide function names aren't provided, fall back to local names.
         if function_names is None:
@@ -132,14 +130,14 @@ class PythonCode(ProgramCode):
             # Check for a function body
             body_node = function_node.child_by_field_name("body")
             if not body_node:
-                logger.debug(f"Skipping {current_function_name} because it has no function body")
+                logger.debug("Skipping {} because it has no function body", current_function_name)
                 continue
 
             # Check for basic return type
             return_type_node = function_node.child_by_field_name("return_type")
             # If no return type hint, assume it's basic (e.g., None or implicit None)
             if return_type_node and not self._is_basic_python_type(return_type_node, code):
-                logger.debug(f"Skipping {current_function_name} due to non-basic return type")
+                logger.debug("Skipping {} due to non-basic return type", current_function_name)
                 continue # Not a leaf function if return type is not basic
 
             # Check for basic arguments
@@ -149,14 +147,14 @@ class PythonCode(ProgramCode):
                 type_node = param_node.child_by_field_name("type")
                 if type_node and not self._is_basic_python_type(type_node, code):
                     type_text = self._node_text(type_node, code)
-                    logger.info(f"Skipping '{current_function_name}': Non-basic argument type '{type_text}'.")
+                    logger.info("Skipping '{}': Non-basic argument type '{}'.", current_function_name, type_text)
                     is_basic_args = False
                     break
                     is_basic_args = False
                     break
             
             if not is_basic_args:
-                logger.debug(f"Skipping {current_function_name} due to non-basic arguments")
+                logger.debug("Skipping {} due to non-basic arguments", current_function_name)
                 continue # Not a leaf function if arguments are not basic
 
             # Check for @staticmethod decorator
@@ -179,7 +177,7 @@ class PythonCode(ProgramCode):
                         is_instance_method = True
             
             if is_instance_method:
-                logger.debug(f"Skipping {current_function_name} because it is an instance method")
+                logger.debug("Skipping {} because it is an instance method", current_function_name)
                 continue
 
             has_function_calls = False
@@ -195,7 +193,7 @@ class PythonCode(ProgramCode):
                         if function_call_node and function_call_node.type == "identifier":
                             called_function_name = self._node_text(function_call_node, code)
                             if called_function_name in function_names and called_function_name != current_function_name:
-                                logger.debug(f"Function {current_function_name} calls another user-defined function: {called_function_name}")
+                                logger.debug("Function {} calls another user-defined function: {}", current_function_name, called_function_name)
                                 has_function_calls = True
                                 break # Found a call to another user-defined function, not a leaf
                         elif function_call_node and function_call_node.type == "attribute":
@@ -207,11 +205,10 @@ class PythonCode(ProgramCode):
                                     has_function_calls = True
                                     break # Found a call to another user-defined method, not a leaf
                     
-                    for child in reversed(current_body_node.children):
-                        body_stack.append(child)
+                    body_stack.extend(reversed(current_body_node.children))
             
             if not has_function_calls:
-                logger.debug(f"Found leaf function: {current_function_name}")
+                logger.debug("Found leaf function: {}", current_function_name)
                 leaf_functions.append({
                     "code": self._node_text(function_node, code),
                     "file_path": file_path,
@@ -3,8 +3,6 @@ import os
 from loguru import logger
 
 from LLM.llmodel import LLMConfig
-from task.java.java_test_workflow import JavaTestWorkflow
-from task.python.python_test_workflow import PythonTestWorkflow
 
 
 def run_create_test_workflow(
@@ -41,9 +39,14 @@ def run_create_test_workflow(
     for code_hash in code_block_hashes:
         logger.info(f"Processing code block: {code_hash}")
         workflow = None
+        # Workflows pull in the tool and build stacks; import only the one that is used.
         if language.lower() == "java":
+            from task.java.java_test_workflow import JavaTestWorkflow
+
             workflow = JavaTestWorkflow(project_path, language, llm_config, code_hash)
         elif language.lower() == "python":
+            from task.python.python_test_workflow import PythonTestWorkflow
+
             workflow = PythonTestWorkflow(project_path, language, llm_config, code_hash)
             pass
         else:
@@ -3,6 +3,8 @@ from loguru import logger
 from static.code_match import JavaCode, PythonCode, ProgramCode
 from typing import List, Dict, Any
 
+_ANALYZERS = {"java": JavaCode, "python": PythonCode}
+
 def create_code_analyzer(language: str) -> ProgramCode:
     """
     Factory function to create a Code Analyzer instance based on the language.
@@ -16,12 +18,10 @@ def create_code_analyzer(language: str) -> ProgramCode:
     Raises:
         ValueError: If an unsupported language is provided.
     """
-    if language.lower() == "java":
-        return JavaCode()
-    elif language.lower() == "python":
-        return PythonCode()
-    else:
+    analyzer_class = _ANALYZERS.get(language.lower())
+    if analyzer_class is None:
         raise ValueError(f"Unsupported language: {language}")
+    return analyzer_class()
 
 def run_processing(project_name: str, language: str, overwrite: bool = False):
     """
@@ -36,10 +36,17 @@ def run_processing(project_name: str, language: str, overwrite: bool = False):
     """
     logger.info(f"Starting processing of project: {project_name}")
     
+    output_dir = os.path.join(project_name, "ana_json")
+    output_file = os.path.join(output_dir, f"{language.lower()}_leaf.json")
+
+    # Skip processing if AST file already exists and overwrite is False
+    if not overwrite and os.path.exists(output_file):
+        logger.info(f"Skipped processing for {project_name} as AST file already exists and overwrite is False.")
+        return
+
     # Create a code analyzer instance using the factory function
     code_ana = create_code_analyzer(language)
-    
-    output_dir = os.path.join(project_name, "ana_json")
+
     if not os.path.exists(output_dir):
         try:
             os.mkdir(output_dir)
@@ -47,12 +54,6 @@ def run_processing(project_name: str, language: str, overwrite: bool = False):
             logger.error(f"Error: The parent directory for '{output_dir}' does not exist.")
             logger.error("Please ensure the base project path is correct and accessible.")
             return
-    output_file = os.path.join(output_dir, f"{language.lower()}_leaf.json")
-
-    # Skip processing if AST file already exists and overwrite is False
-    if not overwrite and os.path.exists(output_file):
-        logger.info(f"Skipped processing for {project_name} as AST file already exists and overwrite is False.")
-        return
 
     # Find specific files within the directory
     files = code_ana.find_specific_files(project_name)
@@ -1,8 +1,11 @@
+import asyncio
+import hashlib
 import json
 import os
 import re
+import shelve
 import sys
-from typing import Optional, Type
+from typing import Optional, Type, Union
 
 from langchain_core.messages import AIMessage
 from loguru import logger
@@ -15,6 +18,9 @@ from static.projectUtil import read_code_block, save_code_block
 from utils.log_utils import logger, tqdm_logger
 
 BLOCK_SIZE_LIMIT = 5120
+# Answers per (model, prompts, code block), kept in the dataset directory and shared by its
+# projects; duplicated blocks are only asked once.
+SENSITIVE_CACHE_NAME = ".sensitive_cache"
 LLM_SYSTEM_PROMPT = """You are an expert in code security and TEE (Trusted Execution Environment).
 Your task is to identify "leaf functions" that are suitable for porting to a TEE.
 
@@ -57,15 +63,18 @@ def get_sensitive_statements_prompt(block: str, sensitive_types: list[str]) -> s
 
 
 
-def _invoke_llm_chat(
-    agent: LLModel, prompt: str, output_format: Optional[Type[BaseModel]] = None
+async def _ainvoke_llm_chat(
+    agent: LLModel,
+    prompt: str,
+    output_format: Optional[Type[BaseModel]] = None,
+    usage: Optional[dict] = None,
 ):
     # Create a chat with structured output if format is provided
     chat = agent.create_stateless_chat(
         system_prompt=LLM_SYSTEM_PROMPT, output_format=output_format
     )
 
-    result = chat.invoke({"messages": [{"role": "user", "content": prompt}]})
+    result = await chat.ainvoke({"messages": [{"role": "user", "content": prompt}]})
 
     # Manually extract token usage from the AIMessage
     if "messages" in result:
@@ -75,6 +84,9 @@ def _invoke_llm_chat(
                 completion_tokens = message.usage_metadata.get("output_tokens", 0)
                 agent.total_input_tokens += input_tokens
                 agent.total_completion_tokens += completion_tokens
+                if usage is not None:
+                    usage["input"] += input_tokens
+                    usage["completion"] += completion_tokens
                 logger.debug(
                     f"Token usage for current invoke: Input={input_tokens}, Completion={completion_tokens}. "
                     f"Total: Input={agent.total_input_tokens}, Completion={agent.total_completion_tokens}"
@@ -88,93 +100,194 @@ def _invoke_llm_chat(
 
 
 
-def query_sensitive_project(
-    project_path: str, language: str, llm_config: LLMConfig
-) -> None:
-    
-    in_name = f"{language}_leaf"
-    out_name = f"{llm_config.get_description()}{OUTPUT_NAME_SUFFIX}"
+# Cached answers are only valid for the prompts that produced them
+_PROMPTS_DIGEST = hashlib.blake2b(
+    "\0".join((
+        LLM_SYSTEM_PROMPT,
+        get_check_sensitive_prompt(""),
+        get_sensitive_type_prompt(""),
+        get_sensitive_statements_prompt("", []),
+    )).encode(),
+    digest_size=8,
+).hexdigest()
+
+
+def _block_cache_key(block: str, model_description: str) -> str:
+    digest = hashlib.blake2b(block.encode(), digest_size=16).hexdigest()
+    return f"{model_description}:{_PROMPTS_DIGEST}:{digest}"
+
+
+async def _aask_sensitive_questions(
+    block: str, agent: LLModel, usage: dict
+) -> Union[tuple, bool, None]:
+    """
+    Asks the three sensitive-check questions for one code block.
+
+    Returns:
+        Union[tuple, bool, None]: ``(sensitive_check, sensitive_types, statements_dict)`` if all
+        three questions pass, False if the model answered that the block is not sensitive, and
+        None if an answer was missing or empty.
+    """
+    # First question
+    prompt1 = get_check_sensitive_prompt(block)
+    result1_obj = await _ainvoke_llm_chat(
+        agent,
+        prompt1,
+        output_format=QuestionBool,
+        usage=usage,
+    )
+    if result1_obj is None:
+        return None
+    result1 = result1_obj.answer
+
+    if not result1: # The condition now directly uses the boolean result1
+        return False
+
+    # Second question
+    prompt2 = get_sensitive_type_prompt(block)
+    result2 = await _ainvoke_llm_chat(
+        agent,
+        prompt2,
+        output_format=SensitiveType,
+        usage=usage,
+    )
+    if not result2 or not result2.type_list:
+        return None
+
+    sensitive_types = list(set(result2.type_list))
+
+    # Third question
+    prompt3 = get_sensitive_statements_prompt(block, sensitive_types)
+    result3 = await _ainvoke_llm_chat(
+        agent,
+        prompt3,
+        output_format=SensitiveStatement,
+        usage=usage,
+    )
 
-    logger.info(f"Switch to {project_path}.")
-    input_dir = os.path.join(project_path, "ana_json")
-    codes = read_code_block(input_dir, in_name)
-    out = []
-    processed_blocks = 0
+    if not result3 or not result3.statements:
+        return None
 
-    for code in tqdm(codes, desc="Processing", unit="item", mininterval=1):
-        try:
-            agent = LLModel.from_config(llm_config)
-            # Store token counts before processing this code block
-            start_input_tokens = agent.total_input_tokens
-            start_completion_tokens = agent.total_completion_tokens
-
-            block = code["code"]
-
-            if len(block) > BLOCK_SIZE_LIMIT:
-                logger.debug("Over size, skip...")
-                continue
-
-            processed_blocks += 1
-            # First question
-            prompt1 = get_check_sensitive_prompt(block)
-            result1_obj = _invoke_llm_chat(
-                agent,
-                prompt1,
-                output_format=QuestionBool,
-            )
-            # Convert string to boolean
-            result1 = result1_obj.answer if result1_obj else False
-
-            if not result1: # The condition now directly uses the boolean result1
-                continue
-
-            # Second question
-            prompt2 = get_sensitive_type_prompt(block)
-            result2 = _invoke_llm_chat(
-                agent,
-                prompt2,
-                output_format=SensitiveType,
-            )
-            if not result2 or not result2.type_list:
-                continue
+    statements_dict = {item.type: item.statements for item in result3.statements}
+    return result1, sensitive_types, statements_dict
 
-            sensitive_types = list(set(result2.type_list))
 
-            # Third question
-            prompt3 = get_sensitive_statements_prompt(block, sensitive_types)
-            result3 = _invoke_llm_chat(
-                agent,
-                prompt3,
-                output_format=SensitiveStatement,
+async def _aanswer_block(
+    block: str, agent: LLModel, semaphore: asyncio.Semaphore
+) -> Union[tuple, bool, None]:
+    """Asks the questions for one code block once a slot is free; None if an error occurred."""
+    async with semaphore:
+        try:
+            # The agent is shared by concurrent blocks, so count this block's tokens separately
+            usage = {"input": 0, "completion": 0}
+            answers = await _aask_sensitive_questions(block, agent, usage)
+        except Exception as e:
+            logger.error(f"Error processing code block: {e}")
+            return None
+
+    # Log token usage for this session
+    session_input_tokens = usage["input"]
+    session_completion_tokens = usage["completion"]
+    logger.info(
+        f"Session token usage for code block: Input={session_input_tokens}, "
+        f"Completion={session_completion_tokens}, "
+        f"Total={session_input_tokens + session_completion_tokens}"
+    )
+    return answers
+
+
+async def _aquery_sensitive_block(
+    code: dict,
+    agent: LLModel,
+    semaphore: asyncio.Semaphore,
+    cache: Optional[shelve.Shelf] = None,
+    model_description: str = "",
+    inflight: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Runs the three sensitive-check questions for one code block; returns the annotated block or None.
+    Blocks already in ``cache``, or already asked about in this run (``inflight``), are not asked again.
+    """
+    block = code["code"]
+    if len(block) > BLOCK_SIZE_LIMIT:
+        logger.debug("Over size, skip...")
+        return None
+
+    key = _block_cache_key(block, model_description)
+    if cache is not None and key in cache:
+        answers = cache[key]
+        logger.debug("Sensitive answers for code block found in cache.")
+    elif inflight is not None and key in inflight:
+        # An identical block of this run is (or was) being asked about; share its answers
+        answers = await inflight[key]
+    else:
+        task = asyncio.ensure_future(_aanswer_block(block, agent, semaphore))
+        if inflight is not None:
+            inflight[key] = task
+        answers = await task
+        # Only actual verdicts are cached: a missing or empty answer is asked again next run.
+        if cache is not None and answers is not None:
+            cache[key] = answers
+
+    if not answers:
+        return None
+
+    # If all three questions pass, retain the item and add the new attributes
+    code["sensitive_check"], code["sensitive_type"], code["sensitive_statements"] = answers
+    logger.info(
+        f"All sensitive checks passed and statements extracted for function. Sensitive check result: {code}"
+    )
+    return code
+
+
+async def _aquery_sensitive_blocks(
+    codes: list,
+    llm_config: LLMConfig,
+    concurrency: int,
+    cache: Optional[shelve.Shelf] = None,
+) -> list:
+    """Queries all code blocks concurrently, keeping at most ``concurrency`` blocks in flight."""
+    # One model (and its cached chains) serves every block.
+    agent = LLModel.from_config(llm_config)
+    model_description = llm_config.get_description()
+    semaphore = asyncio.Semaphore(concurrency)
+    # Questions per block key started in this run, so duplicated blocks are only asked once
+    inflight: dict[str, asyncio.Future] = {}
+    progress = tqdm(total=len(codes), desc="Processing", unit="item", mininterval=1)
+
+    async def _run(code: dict) -> Optional[dict]:
+        try:
+            return await _aquery_sensitive_block(
+                code, agent, semaphore, cache, model_description, inflight
             )
+        finally:
+            progress.update(1)
 
-            if not result3 or not result3.statements:
-                continue
+    try:
+        results = await asyncio.gather(*(_run(code) for code in codes))
+    finally:
+        progress.close()
+    # gather preserves input order, so the output keeps the order of the leaf file.
+    return [code for code in results if code is not None]
 
-            # If all three questions pass, retain the item and add the new attributes
 
-            code["sensitive_check"] = result1
-            code["sensitive_type"] = sensitive_types
-            statements_dict = {item.type: item.statements for item in result3.statements}
-            code["sensitive_statements"] = statements_dict
-            logger.info(
-                f"All sensitive checks passed and statements extracted for function. Sensitive check result: {code}"
-            )
-            out.append(code)
+def query_sensitive_project(
+    project_path: str, language: str, llm_config: LLMConfig, concurrency: int = 8
+) -> None:
+    
+    in_name = f"{language}_leaf"
+    out_name = f"{llm_config.get_description()}{OUTPUT_NAME_SUFFIX}"
 
-            # Calculate and log token usage for this session
-            session_input_tokens = agent.total_input_tokens - start_input_tokens
-            session_completion_tokens = (
-                agent.total_completion_tokens - start_completion_tokens
-            )
-            logger.info(
-                f"Session token usage for code block: Input={session_input_tokens}, "
-                f"Completion={session_completion_tokens}, "
-                f"Total={session_input_tokens + session_completion_tokens}"
-            )
-        except Exception as e:
-            logger.error(f"Error processing code block: {e}")
-            continue
+    logger.info(f"Switch to {project_path}.")
+    input_dir = os.path.join(project_path, "ana_json")
+    codes = read_code_block(input_dir, in_name)
+    # The projects of a dataset are its subdirectories, so they share one cache.
+    # Blocks run on one event loop, so the shelf needs no lock.
+    dataset_path = os.path.dirname(os.path.abspath(project_path))
+    with shelve.open(os.path.join(dataset_path, SENSITIVE_CACHE_NAME)) as cache:
+        out = asyncio.run(
+            _aquery_sensitive_blocks(codes, llm_config, concurrency, cache)
+        )
 
     output_dir = os.path.join(project_path, "ana_json")
     if not os.path.exists(output_dir):
@@ -1,7 +1,6 @@
 import os
 from loguru import logger
 from LLM.llmodel import LLMConfig
-from task.java.java_to_rust_transform_workflow import JavaToRustTransformWorkflow
 
 def run_transform_workflow(
     project_path: str, language: str, llm_config: LLMConfig
@@ -32,6 +31,9 @@ def run_transform_workflow(
         logger.info(f"Processing code block: {code_hash}")
         workflow = None
         if language.lower() == "java":
+            # Imported here so loading this module does not pull in the tool and build stacks.
+            from task.java.java_to_rust_transform_workflow import JavaToRustTransformWorkflow
+
             workflow = JavaToRustTransformWorkflow(project_path, code_hash, llm_config)
         else:
             logger.error(
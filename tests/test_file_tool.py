@@ -0,0 +1,37 @@
+import unittest
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from LLM.tools.file_tool import create_permission_checker
+
+
+class TestPermissionChecker(unittest.TestCase):
+
+    def test_directory_entry_covers_children(self):
+        checker = create_permission_checker({"src/": "rw", "docs/": "r"})
+        self.assertTrue(checker(Path("src/main.py")))
+        self.assertTrue(checker(Path("src/pkg/mod.py")))
+        self.assertFalse(checker(Path("docs/index.md")))
+
+    def test_unmatched_path_is_not_writable(self):
+        checker = create_permission_checker({"src/": "rw"})
+        self.assertFalse(checker(Path("srcfoo/main.py")))
+        self.assertFalse(checker(Path("README.md")))
+
+    def test_most_specific_entry_wins(self):
+        checker = create_permission_checker({".": "r", "rust": "rw", "rust/Cargo.toml": "r"})
+        self.assertFalse(checker(Path("pom.xml")))
+        self.assertTrue(checker(Path("rust/src/lib.rs")))
+        self.assertFalse(checker(Path("rust/Cargo.toml")))
+
+    def test_permission_is_case_insensitive(self):
+        checker = create_permission_checker({"src/main.py": "RW"})
+        self.assertTrue(checker(Path("src/main.py")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from LLM.states import task_states
+
+
+class TestTaskState(unittest.TestCase):
+
+    def test_empty_state_is_success(self):
+        self.assertTrue(task_states.TaskState([]).is_success())
+
+    def test_success_requires_all_states(self):
+        state = task_states.TaskState(["a", "b"])
+        state.set_success("a")
+        self.assertFalse(state.is_success())
+        state.set_success("b")
+        self.assertTrue(state.is_success())
+        self.assertEqual(state.states, {"a": True, "b": True})
+
+    def test_unknown_keys_are_ignored(self):
+        state = task_states.TaskState(["a"])
+        state.set_success("missing")
+        state.set_failed("missing")
+        self.assertEqual(state.states, {"a": False})
+
+    def test_reset(self):
+        state = task_states.TaskState(["a"])
+        state.set_success("a")
+        state.reset()
+        self.assertFalse(state.is_success())
+
+
+class TestDependentStates(unittest.TestCase):
+
+    def test_test_gen_unit_test_failure_clears_coverage(self):
+        state = task_states.TestGenTaskState()
+        state.set_success("unit_test")
+        state.set_success("coverage_pass")
+        state.set_failed("unit_test")
+        self.assertEqual(state.states, {"unit_test": False, "coverage_pass": False})
+
+    def test_test_gen_coverage_failure_keeps_unit_test(self):
+        state = task_states.TestGenTaskState()
+        state.set_success("unit_test")
+        state.set_success("coverage_pass")
+        state.set_failed("coverage_pass")
+        self.assertEqual(state.states, {"unit_test": True, "coverage_pass": False})
+
+    def test_convert_cargo_check_failure_clears_unit_test(self):
+        state = task_states.ConvertTaskState()
+        state.set_success("unit_test")
+        state.set_success("cargo_check")
+        state.set_failed("cargo_check")
+        self.assertFalse(state.is_success())
+        self.assertEqual(state.states, {"unit_test": False, "cargo_check": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
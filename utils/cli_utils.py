@@ -11,6 +11,32 @@ from langchain_core.messages import AIMessage, ToolMessage
 from loguru import logger
 
 
+# Extended regex to remove both CSI and OSC sequences (including hyperlinks)
+_ANSI_ESCAPE_RE = re.compile(
+    r'\x1B\[[0-?]*[ -/]*[@-~]'  # CSI sequences
+    r'|'
+    r'\x1B\][^\x1B\x07]*(?:\x07|\x1B\\)'  # OSC sequences (e.g. hyperlinks)
+)
+_PROGRESS_PREFIXES = ("Building", "Adding", "Compiling")
+
+
+def clean_cmd_output(out_text: str | None) -> str:
+    """Strip ANSI escape sequences and build progress lines from command output.
+
+    :param out_text: Raw command output
+    :type out_text: str | None
+    :returns: Output with ANSI escape sequences and build messages removed
+    :rtype: str
+    """
+    # Remove ANSI escape sequences from output, ensuring out_text is a string
+    clean_output = _ANSI_ESCAPE_RE.sub('', out_text or '')
+
+    # Filter out "Building"/"Adding"/"Compiling" progress lines and recombine the rest
+    return '\n'.join(
+        line for line in clean_output.splitlines()
+        if not line.lstrip().startswith(_PROGRESS_PREFIXES)
+    )
+
 
 def run_cmd(cmd: list[str], exe_env: str) -> str:
     """Execute a shell command and return its output.
@@ -37,23 +63,7 @@ def run_cmd(cmd: list[str], exe_env: str) -> str:
         out_text = child.before
         #logger.debug(out_text)
 
-        # Remove ANSI escape sequences from output, ensuring out_text is a string
-        # Extended regex to remove both CSI and OSC sequences (including hyperlinks)
-        ansi_escape = re.compile(
-            r'\x1B\[[0-?]*[ -/]*[@-~]'  # CSI sequences
-            r'|'
-            r'\x1B\][^\x1B\x07]*(?:\x07|\x1B\\)'  # OSC sequences (e.g. hyperlinks)
-        )
-        clean_output = ansi_escape.sub('', out_text or '')
-
-        # Split the string into lines
-        lines = clean_output.splitlines()
-
-        # Filter out lines that start with "Building"
-        filtered_lines = [line for line in lines if not any(line.lstrip().startswith(prefix) for prefix in ("Building", "Adding", "Compiling"))]
-
-        # Recombine the remaining lines into a single string
-        return '\n'.join(filtered_lines)
+        return clean_cmd_output(out_text)
     except Exception as e:
         return f"Running error: {e}"
 
@@ -1,10 +1,13 @@
+import functools
 import os
 
+@functools.lru_cache(maxsize=1)
 def get_java_pom_template() -> str:
     """
     Returns the content of the Java Maven pom.xml template by reading it from a file.
+    The template is static, so it is read once and cached for the process.
     """
     # Assuming the template file is located at utils/java_pom_template.xml
     template_path = os.path.join(os.path.dirname(__file__), "java_pom_template.xml")
     with open(template_path, "r", encoding="utf-8") as f:
-        return f.read()
\ No newline at end of file
+        return f.read()